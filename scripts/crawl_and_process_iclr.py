@@ -3,29 +3,76 @@
 Master script to crawl ICLR papers and process them (download PDFs + convert to markdown)
 """
 
+import copy
+import logging
+import logging.handlers
 import sys
 import os
-import json
 from pathlib import Path
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from itertools import islice
+
+from tqdm import tqdm
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.crawler.crawl import crawl_iclr_papers_and_reviews, save_data
-from src.processor import PaperProcessor
-import yaml
+from src.config_cache import load_config
+from src.processor import PaperProcessor, ResultStatus, STATUS_IDX, results_by_status
+from src.utils.json_io import iter_papers, write_json, write_paper_shards, write_papers
+
+logger = logging.getLogger(__name__)
+
+# Fields the processing pipeline requires, with fallbacks for papers missing them
+PAPER_DEFAULTS = {
+    'title': 'Unknown Title',
+    'pdf_url': '',
+    'authors': [],
+    'abstract': '',
+}
+
+class PaperSourceError(Exception):
+    """The crawl output file could not be opened or parsed"""
 
-def load_config():
-    """Load configuration from config.yaml"""
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+def _read_source(path):
+    """Stream papers from path, reporting open and parse errors as PaperSourceError
 
-def crawl_iclr_papers(year=2024, accepted_only=False, limit=None):
+    Errors raised while processing the papers pass through unchanged.
+    """
+    try:
+        yield from iter_papers(path)
+    except (OSError, ValueError) as e:
+        raise PaperSourceError(e) from e
+
+def setup_logging(config):
+    """Send log output to a rotating file so the console only shows the progress bar"""
+    log_file = config['logging']['file'].replace(
+        "{timestamp}", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    # delay=True: the file is only opened once the first record is emitted
+    handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5,
+        encoding='utf-8',
+        delay=True
+    )
+    logging.basicConfig(
+        level=getattr(logging, config['logging']['level']),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[handler]
+    )
+
+def crawl_iclr_papers(year=2024, accepted_only=False, limit=None, save_intermediate=False, shards=1):
     """
     Crawl ICLR papers using the existing crawler
+
+    Returns the papers as processor-ready dicts. The intermediate JSON file is
+    only written when save_intermediate is set; with shards > 1 it is split into
+    a directory of shard files written in parallel.
     """
     print(f"{'='*60}")
     print(f"Crawling ICLR {year} papers...")
@@ -47,127 +94,115 @@ def crawl_iclr_papers(year=2024, accepted_only=False, limit=None):
 
     print(f"✓ Successfully crawled {len(papers)} papers")
 
-    # Save to JSON file that processing pipeline expects
-    # Convert Paper objects to dictionaries
+    # Convert Paper objects to the dictionaries the processing pipeline expects
     papers_dict = []
     for paper in papers:
-        if hasattr(paper, 'model_dump'):
-            paper_dict = paper.model_dump()
-        else:
-            paper_dict = paper
+        # Plain dicts are used as-is; only Paper models need serializing
+        paper_dict = paper if isinstance(paper, dict) else paper.model_dump()
 
         # Ensure required fields for processing pipeline
-        paper_dict.setdefault('paper_id', paper_dict.get('id', f'unknown_{len(papers_dict)}'))
-        paper_dict.setdefault('title', paper_dict.get('title', 'Unknown Title'))
-        paper_dict.setdefault('pdf_url', paper_dict.get('pdf_url', ''))
-        paper_dict.setdefault('authors', paper_dict.get('authors', []))
-        paper_dict.setdefault('abstract', paper_dict.get('abstract', ''))
+        if 'paper_id' not in paper_dict:
+            paper_dict['paper_id'] = paper_dict.get('id', f'unknown_{len(papers_dict)}')
+        for key in PAPER_DEFAULTS.keys() - paper_dict.keys():
+            paper_dict[key] = copy.copy(PAPER_DEFAULTS[key])
 
         papers_dict.append(paper_dict)
 
-    # Save to the expected input format for processing
-    output_file = f"iclr_{year}_papers_reviews{'_accepted' if accepted_only else ''}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(papers_dict, f, indent=2, ensure_ascii=False)
+    if save_intermediate:
+        output_path = intermediate_path(year, accepted_only, sharded=shards > 1)
+        if shards > 1:
+            write_paper_shards(output_path, papers_dict, num_shards=shards)
+        else:
+            write_papers(output_path, papers_dict)
+        print(f"✓ Saved crawled data to: {output_path}")
+
+    return papers_dict
 
-    print(f"✓ Saved crawled data to: {output_file}")
-    return output_file
+def intermediate_path(year, accepted_only, sharded=False):
+    """Path of the crawl output read back by --skip-crawl (a directory when sharded)"""
+    name = f"iclr_{year}_papers_reviews{'_accepted' if accepted_only else ''}"
+    return name if sharded else name + ".json"
 
 def process_papers(input_json, config, limit=None):
     """
     Process papers through the pipeline (download PDFs + convert to markdown)
+
+    input_json is either a path to a crawl output file or an iterable of
+    already-loaded paper dicts.
     """
+    from_file = isinstance(input_json, (str, Path))
+    source = str(input_json) if from_file else "in-memory crawl results"
+
     print(f"\n{'='*60}")
     print("Starting paper processing pipeline...")
-    print(f"Input file: {input_json}")
+    print(f"Input: {source}")
     print(f"{'='*60}")
 
-    # Load papers from JSON
-    try:
-        with open(input_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Handle different JSON formats
-        if isinstance(data, list):
-            # Direct array of papers
-            papers = data
-        elif isinstance(data, dict) and 'papers' in data:
-            # Wrapped format with metadata
-            papers = data['papers']
-        else:
-            print(f"❌ Unexpected JSON format in {input_json}")
-            return False
-
-        print(f"✓ Loaded {len(papers)} papers from {input_json}")
-    except Exception as e:
-        print(f"❌ Failed to load papers from {input_json}: {e}")
-        return False
+    if from_file:
+        # Stream papers from JSON (both bare-list and wrapped formats) so the
+        # whole crawl output is never held in memory at once
+        papers = _read_source(input_json)
+        expected = None
+    else:
+        papers = iter(input_json)
+        expected = len(input_json) if hasattr(input_json, '__len__') else None
 
     # Apply limit if specified
-    if limit and len(papers) > limit:
-        papers = papers[:limit]
-        print(f"✓ Limited to first {len(papers)} papers")
+    if limit:
+        papers = islice(papers, limit)
+        expected = min(expected, limit) if expected is not None else limit
+        print(f"✓ Limited to first {limit} papers")
 
     # Initialize processor
     processor = PaperProcessor(config)
 
     # Process papers
-    results = {
-        "completed": [],
-        "failed_download": [],
-        "failed_conversion": [],
-        "skipped": []
-    }
+    ids_by_status = [[] for _ in ResultStatus]
 
     start_time = time.time()
+    total_papers = 0
 
     print("\nProcessing papers...")
-    for i, paper in enumerate(papers, 1):
-        paper_id = paper.get('paper_id', f'paper_{i}')
-        title = paper.get('title', 'Unknown')[:50]
-
-        print(f"[{i}/{len(papers)}] Processing: {title}...")
-
-        result = processor.process_paper(paper)
-
-        status = result['status']
-        if status in results:
-            results[status].append(result['paper_id'])
-
-        # Show brief status
-        if status == 'completed':
-            print("  ✓ Completed")
-        elif status == 'skipped':
-            print("  ⏭️  Skipped (already processed)")
-        elif status == 'failed_download':
-            print("  ❌ Failed (PDF download)")
-        elif status == 'failed_conversion':
-            print("  ❌ Failed (markdown conversion)")
-        else:
-            print(f"  ❓ {status}")
+    try:
+        # Papers are processed concurrently, so results arrive in completion order.
+        # Per-paper detail goes to the log file; the console only shows the progress bar.
+        for result in tqdm(processor.process_papers(papers), total=expected,
+                           desc="Processing", smoothing=0.1):
+            total_papers += 1
+
+            idx = STATUS_IDX.get(result['status'])
+            if idx is not None:
+                ids_by_status[idx].append(result['paper_id'])
+
+            logger.debug("Processed %s: %s", result['paper_id'], result['status'])
+    except PaperSourceError as e:
+        print(f"❌ Failed to load papers from {source}: {e}")
+        return False
+
+    results = results_by_status(ids_by_status)
 
     # Save processing summary
     summary_path = Path(config['storage']['base_dir']) / "index" / "crawl_and_process_summary.json"
     summary_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "input_file": input_json,
-        "total_papers": len(papers),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        "input_file": source,
+        "total_papers": total_papers,
         "results": results,
         "processing_time_seconds": time.time() - start_time,
         "config": config
     }
 
     summary_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(summary_path, 'w') as f:
-        json.dump(summary_data, f, indent=2)
+    write_json(summary_path, summary_data)
 
     # Print final summary
     print(f"\n{'='*60}")
     print("Processing Complete!")
     print(f"{'='*60}")
-    print(f"Total papers processed: {len(papers)}")
+    print(f"Total papers processed: {total_papers}")
     print(f"Completed: {len(results['completed'])}")
     print(f"Skipped: {len(results['skipped'])}")
+    print(f"Unchanged: {len(results['unchanged'])}")
     print(f"Failed downloads: {len(results['failed_download'])}")
     print(f"Failed conversions: {len(results['failed_conversion'])}")
     print(f"Total time: {time.time() - start_time:.1f} seconds")
@@ -185,11 +220,16 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit number of papers to crawl')
     parser.add_argument('--skip-crawl', action='store_true', help='Skip crawling, use existing JSON file')
     parser.add_argument('--input-file', help='Use specific input JSON file instead of crawling')
+    parser.add_argument('--save-intermediate', action='store_true',
+                        help='Also write crawled papers to JSON so later runs can use --skip-crawl')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Split the intermediate JSON into this many shard files written in parallel')
 
     args = parser.parse_args()
 
     # Load configuration
     config = load_config()
+    setup_logging(config)
 
     print("🚀 ICLR Paper Crawler & Processor")
     print(f"Year: {args.year}")
@@ -206,21 +246,27 @@ def main():
             return 1
         print(f"Using existing input file: {input_json}")
     elif args.skip_crawl:
-        # Try to find existing file
-        pattern = f"iclr_{args.year}_papers_reviews{'_accepted' if args.accepted_only else ''}.json"
+        # Try to find existing file, then a sharded directory
+        pattern = intermediate_path(args.year, args.accepted_only)
+        sharded = intermediate_path(args.year, args.accepted_only, sharded=True)
         if Path(pattern).exists():
             input_json = pattern
             print(f"Using existing file: {input_json}")
+        elif Path(sharded).is_dir():
+            input_json = sharded
+            print(f"Using existing shards: {input_json}")
         else:
             print(f"❌ No existing file found: {pattern}")
-            print("Run without --skip-crawl to crawl papers first")
+            print("Run without --skip-crawl and with --save-intermediate to crawl papers first")
             return 1
     else:
-        # Crawl papers
+        # Crawl papers and hand them straight to the processor
         input_json = crawl_iclr_papers(
             year=args.year,
             accepted_only=args.accepted_only,
-            limit=args.limit
+            limit=args.limit,
+            save_intermediate=args.save_intermediate,
+            shards=args.shards
         )
 
         if not input_json:
@@ -3,15 +3,45 @@ Simple script to crawl first 50 ICLR papers with all information
 """
 
 import openreview
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import attrgetter
 import os
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from src.utils.json_io import write_papers
+from src.utils.rate_limiter import RateLimiter
+
+# URL prefixes for a forum id
+PDF_PREFIX = "https://openreview.net/pdf?id="
+FORUM_PREFIX = "https://openreview.net/forum?id="
+
+# Concurrency and request rate for per-forum note fetches
+NOTE_FETCH_WORKERS = 8
+NOTE_FETCH_RATE = 10  # requests per second
+NOTE_FETCH_RETRIES = 5
+
+# Content keys used to recognise a reply when its invitation is not conclusive
+REVIEW_KEYS = frozenset(['rating', 'confidence', 'review'])
+COMMENT_KEYS = frozenset(['comment', 'rebuttal'])
+CATEGORY_KEYS = REVIEW_KEYS | COMMENT_KEYS | {'decision'}
+
+# Reply category by invitation suffix (the part after the last '/')
+REPLY_CATEGORY = {
+    'Official_Review': 'review',
+    'Decision': 'meta',
+    'Meta_Review': 'meta',
+    'Official_Comment': 'comment',
+    'Rebuttal': 'comment',
+}
+
+# Optional Note attributes copied into replies, with their fallback values
+NOTE_FIELDS = (('invitation', ''), ('replyto', None), ('cdate', None), ('mdate', None))
+
 
 def get_client():
     """Get OpenReview client"""
@@ -39,10 +69,224 @@ def extract_value(content, key):
     return val
 
 
+def has_inline_replies(paper):
+    """Check whether replies were returned with the submission (API v2 with details='replies')"""
+    details = getattr(paper, 'details', None)
+    return bool(details) and 'replies' in details
+
+
+def is_rate_limited(error):
+    """Check whether an OpenReview client error is an HTTP 429 response"""
+    message = str(error)
+    return '429' in message or 'Too Many Requests' in message
+
+
+def fetch_forum_notes(client, api_version, forum_id, limiter):
+    """Fetch all notes of a forum, backing off exponentially when rate limited"""
+    for attempt in range(NOTE_FETCH_RETRIES + 1):
+        limiter.acquire()
+        try:
+            if api_version == 'v2':
+                notes = list(client.get_all_notes(forum=forum_id))
+            else:
+                notes = client.get_all_notes(forum=forum_id)
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == NOTE_FETCH_RETRIES:
+                raise
+            limiter.slow_down()
+            time.sleep(2 ** attempt)
+        else:
+            limiter.record_success()
+            return notes
+
+
+def fetch_all_forum_notes(client, api_version, forum_ids):
+    """Fetch notes for many forums concurrently
+
+    Returns:
+        tuple: (notes keyed by forum id, exceptions keyed by forum id)
+    """
+    notes_by_forum = {}
+    errors_by_forum = {}
+    if not forum_ids:
+        return notes_by_forum, errors_by_forum
+
+    print(f"Fetching notes for {len(forum_ids)} forums...")
+    limiter = RateLimiter(NOTE_FETCH_RATE)
+
+    with ThreadPoolExecutor(max_workers=NOTE_FETCH_WORKERS) as executor:
+        futures = {
+            executor.submit(fetch_forum_notes, client, api_version, forum_id, limiter): forum_id
+            for forum_id in forum_ids
+        }
+        for future in as_completed(futures):
+            forum_id = futures[future]
+            try:
+                notes_by_forum[forum_id] = future.result()
+            except Exception as e:
+                errors_by_forum[forum_id] = e
+
+    return notes_by_forum, errors_by_forum
+
+
+def attr_or_default(sample, name, default):
+    """Return a getter for name, probing a sample object once instead of every object
+
+    All notes returned during one crawl share the same API version and hence the
+    same attributes, so the probe result holds for the whole run.
+    """
+    if hasattr(sample, name):
+        return attrgetter(name)
+    return lambda obj: default
+
+
+def bind_note_accessors(sample_note):
+    """Bind getters for NOTE_FIELDS based on a sample Note"""
+    return tuple(attr_or_default(sample_note, name, default) for name, default in NOTE_FIELDS)
+
+
+def note_to_reply(note, accessors):
+    """Convert a Note object into the same dict shape as details['replies'] entries
+
+    Args:
+        note: Note object
+        accessors: Getters returned by bind_note_accessors
+    """
+    get_invitation, get_replyto, get_cdate, get_mdate = accessors
+    return {
+        'id': note.id,
+        'invitation': get_invitation(note),
+        'replyto': get_replyto(note),
+        'content': note.content,
+        'cdate': get_cdate(note),
+        'mdate': get_mdate(note),
+    }
+
+
+def normalize_reply(reply):
+    """Flatten a reply's content and work out what is needed to categorize it
+
+    Returns:
+        tuple: (note_data dict, invitation suffix, category keys present in the content)
+    """
+    content = {}
+    for key, val in reply.get('content', {}).items():
+        if isinstance(val, dict) and 'value' in val:
+            content[key] = val['value']
+        else:
+            content[key] = val
+
+    invitation = reply.get('invitation', '')
+    _, sep, reply_type = invitation.rpartition('/')
+
+    note_data = {
+        'id': reply.get('id'),
+        'invitation': invitation,
+        'replyto': reply.get('replyto'),
+        'content': content,
+        'created': reply.get('cdate'),
+        'modified': reply.get('mdate'),
+    }
+
+    return note_data, reply_type if sep else '', content.keys() & CATEGORY_KEYS
+
+
+def categorize_reply(reply_type, keys):
+    """Return 'review', 'meta', 'comment' or 'other' for a reply
+
+    The invitation suffix decides when it is a known one; otherwise fall back
+    to the category keys present in the content.
+    """
+    category = REPLY_CATEGORY.get(reply_type)
+    if category is not None:
+        return category
+
+    if keys & REVIEW_KEYS:
+        return 'review'
+    # A 'rating' key would already have matched as a review above
+    if 'decision' in keys:
+        return 'meta'
+    if keys & COMMENT_KEYS:
+        return 'comment'
+    return 'other'
+
+
+def add_review(paper_info, note_data):
+    content = note_data['content']
+    paper_info['reviews'].append({
+        'review_id': note_data['id'],
+        'invitation': note_data['invitation'],
+        'rating': content.get('rating', content.get('recommendation', '')),
+        'confidence': content.get('confidence', ''),
+        'summary': content.get('summary', ''),
+        'soundness': content.get('soundness', ''),
+        'presentation': content.get('presentation', ''),
+        'contribution': content.get('contribution', ''),
+        'strengths': content.get('strengths', ''),
+        'weaknesses': content.get('weaknesses', ''),
+        'questions': content.get('questions', ''),
+        'limitations': content.get('limitations', ''),
+        'review_text': content.get('review', ''),
+        'full_content': content,
+        'created': note_data['created'],
+        'modified': note_data['modified']
+    })
+
+
+def add_meta_review(paper_info, note_data):
+    content = note_data['content']
+    decision = content.get('decision', content.get('recommendation', ''))
+    if decision:
+        paper_info['decision'] = decision
+    paper_info['meta_reviews'].append({
+        'id': note_data['id'],
+        'invitation': note_data['invitation'],
+        'decision': decision,
+        'content': content,
+        'created': note_data['created'],
+        'modified': note_data['modified']
+    })
+
+
+def add_comment(paper_info, note_data):
+    content = note_data['content']
+    paper_info['comments'].append({
+        'comment_id': note_data['id'],
+        'invitation': note_data['invitation'],
+        'comment': content.get('comment', content.get('rebuttal', '')),
+        'title': content.get('title', ''),
+        'full_content': content,
+        'created': note_data['created'],
+        'modified': note_data['modified']
+    })
+
+
+def add_other(paper_info, note_data):
+    # Other replies - add to comments
+    paper_info['comments'].append(note_data)
+
+
+REPLY_HANDLERS = {
+    'review': add_review,
+    'meta': add_meta_review,
+    'comment': add_comment,
+    'other': add_other,
+}
+
+
+def add_reply(paper_info, reply):
+    """Categorize a reply as review, decision/meta-review or comment and add it to paper_info"""
+    note_data, reply_type, keys = normalize_reply(reply)
+    REPLY_HANDLERS[categorize_reply(reply_type, keys)](paper_info, note_data)
+
+
 def crawl_first_50_papers(year=2024, limit=500):
     """
     Crawl first 50 papers from ICLR with all information
 
+    Papers are yielded one at a time as they are built, so callers can write
+    them out without holding the whole crawl in memory.
+
     Args:
         year: ICLR year (default: 2024)
         limit: Number of papers to crawl (default: 50)
@@ -79,13 +323,22 @@ def crawl_first_50_papers(year=2024, limit=500):
     if not submissions:
         print(f"\n✗ No papers found for ICLR {year}")
         print(f"Try visiting: https://openreview.net/group?id={venue_id}")
-        return []
+        return
 
     # Limit to first N papers
     submissions = submissions[:limit]
     print(f"Processing {len(submissions)} papers...\n")
 
-    papers = []
+    # Every submission of a crawl has the same shape, so probe optional attributes once
+    get_forum = attrgetter('forum' if hasattr(submissions[0], 'forum') else 'id')
+    has_number = hasattr(submissions[0], 'number')
+
+    # Papers without inline replies need a separate forum query; run those concurrently up front
+    notes_by_forum, errors_by_forum = fetch_all_forum_notes(client, api_version, [
+        get_forum(paper) for paper in submissions if not has_inline_replies(paper)
+    ])
+    sample_note = next((notes[0] for notes in notes_by_forum.values() if notes), None)
+    note_accessors = bind_note_accessors(sample_note)
 
     for i, paper in enumerate(submissions, 1):
         try:
@@ -96,18 +349,18 @@ def crawl_first_50_papers(year=2024, limit=500):
 
             print(f"[{i}/{len(submissions)}] {title[:60]}...")
 
-            forum_id = paper.forum if hasattr(paper, 'forum') else paper.id
+            forum_id = get_forum(paper)
 
             paper_info = {
                 'paper_id': paper.id,
                 'forum_id': forum_id,
-                'number': paper.number if hasattr(paper, 'number') else i,
+                'number': paper.number if has_number else i,
                 'title': str(title),
                 'abstract': extract_value(paper.content, 'abstract'),
                 'authors': extract_value(paper.content, 'authors'),
                 'keywords': extract_value(paper.content, 'keywords'),
-                'pdf_url': f"https://openreview.net/pdf?id={forum_id}",
-                'forum_url': f"https://openreview.net/forum?id={forum_id}",
+                'pdf_url': PDF_PREFIX + forum_id,
+                'forum_url': FORUM_PREFIX + forum_id,
                 'reviews': [],
                 'comments': [],
                 'meta_reviews': [],
@@ -115,161 +368,21 @@ def crawl_first_50_papers(year=2024, limit=500):
             }
 
             # Process replies if available (for API v2 with details='replies')
-            if hasattr(paper, 'details') and 'replies' in paper.details:
-                replies = paper.details['replies']
-                for reply in replies:
-                    # Extract content
-                    content = {}
-                    for key, val in reply.get('content', {}).items():
-                        if isinstance(val, dict) and 'value' in val:
-                            content[key] = val['value']
-                        else:
-                            content[key] = val
-
-                    invitation = reply.get('invitation', '')
-                    reply_type = invitation.split('/')[-1] if '/' in invitation else ''
-
-                    note_data = {
-                        'id': reply.get('id'),
-                        'invitation': invitation,
-                        'replyto': reply.get('replyto'),
-                        'content': content,
-                        'created': reply.get('cdate'),
-                        'modified': reply.get('mdate'),
-                    }
-
-                    # Categorize by invitation type or content
-                    if reply_type.endswith('Official_Review') or any(key in content for key in ['rating', 'confidence', 'review']):
-                        # This is a review
-                        review_data = {
-                            'review_id': reply.get('id'),
-                            'invitation': invitation,
-                            'rating': content.get('rating', content.get('recommendation', '')),
-                            'confidence': content.get('confidence', ''),
-                            'summary': content.get('summary', ''),
-                            'soundness': content.get('soundness', ''),
-                            'presentation': content.get('presentation', ''),
-                            'contribution': content.get('contribution', ''),
-                            'strengths': content.get('strengths', ''),
-                            'weaknesses': content.get('weaknesses', ''),
-                            'questions': content.get('questions', ''),
-                            'limitations': content.get('limitations', ''),
-                            'review_text': content.get('review', ''),
-                            'full_content': content,
-                            'created': note_data['created'],
-                            'modified': note_data['modified']
-                        }
-                        paper_info['reviews'].append(review_data)
-
-                    elif reply_type.endswith('Decision') or reply_type.endswith('Meta_Review') or (any(key in content for key in ['decision']) and 'rating' not in content):
-                        # This is a decision/meta-review
-                        decision = content.get('decision', content.get('recommendation', ''))
-                        if decision:
-                            paper_info['decision'] = decision
-                        paper_info['meta_reviews'].append({
-                            'id': reply.get('id'),
-                            'invitation': invitation,
-                            'decision': decision,
-                            'content': content,
-                            'created': note_data['created'],
-                            'modified': note_data['modified']
-                        })
-
-                    elif reply_type.endswith('Official_Comment') or reply_type.endswith('Rebuttal') or any(key in content for key in ['comment', 'rebuttal']):
-                        # This is a comment
-                        paper_info['comments'].append({
-                            'comment_id': reply.get('id'),
-                            'invitation': invitation,
-                            'comment': content.get('comment', content.get('rebuttal', '')),
-                            'title': content.get('title', ''),
-                            'full_content': content,
-                            'created': note_data['created'],
-                            'modified': note_data['modified']
-                        })
-                    else:
-                        # Other replies - add to comments
-                        paper_info['comments'].append(note_data)
+            if has_inline_replies(paper):
+                for reply in paper.details['replies']:
+                    add_reply(paper_info, reply)
 
             else:
-                # Fallback: get notes separately (for API v1 or if details not available)
+                # Fallback: notes fetched separately (for API v1 or if details not available)
                 try:
-                    if api_version == 'v2':
-                        notes = list(client.get_all_notes(forum=forum_id))
-                    else:
-                        notes = client.get_all_notes(forum=forum_id)
+                    if forum_id in errors_by_forum:
+                        raise errors_by_forum[forum_id]
 
-                    for note in notes:
+                    for note in notes_by_forum.get(forum_id, []):
                         # Skip the submission itself
                         if note.id == paper.id:
                             continue
-
-                        # Extract all content
-                        content = {}
-                        for key, val in note.content.items():
-                            if isinstance(val, dict) and 'value' in val:
-                                content[key] = val['value']
-                            else:
-                                content[key] = val
-
-                        invitation = note.invitation if hasattr(note, 'invitation') else ''
-                        reply_type = invitation.split('/')[-1] if '/' in invitation else ''
-
-                        note_data = {
-                            'id': note.id,
-                            'invitation': invitation,
-                            'replyto': note.replyto if hasattr(note, 'replyto') else None,
-                            'content': content,
-                            'created': note.cdate if hasattr(note, 'cdate') else None,
-                            'modified': note.mdate if hasattr(note, 'mdate') else None,
-                        }
-
-                        # Categorize similar to above
-                        if reply_type.endswith('Official_Review') or any(key in content for key in ['rating', 'confidence', 'review']):
-                            review_data = {
-                                'review_id': note.id,
-                                'invitation': invitation,
-                                'rating': content.get('rating', content.get('recommendation', '')),
-                                'confidence': content.get('confidence', ''),
-                                'summary': content.get('summary', ''),
-                                'soundness': content.get('soundness', ''),
-                                'presentation': content.get('presentation', ''),
-                                'contribution': content.get('contribution', ''),
-                                'strengths': content.get('strengths', ''),
-                                'weaknesses': content.get('weaknesses', ''),
-                                'questions': content.get('questions', ''),
-                                'limitations': content.get('limitations', ''),
-                                'review_text': content.get('review', ''),
-                                'full_content': content,
-                                'created': note_data['created'],
-                                'modified': note_data['modified']
-                            }
-                            paper_info['reviews'].append(review_data)
-
-                        elif reply_type.endswith('Decision') or reply_type.endswith('Meta_Review') or (any(key in content for key in ['decision']) and 'rating' not in content):
-                            decision = content.get('decision', content.get('recommendation', ''))
-                            if decision:
-                                paper_info['decision'] = decision
-                            paper_info['meta_reviews'].append({
-                                'id': note.id,
-                                'invitation': invitation,
-                                'decision': decision,
-                                'content': content,
-                                'created': note_data['created'],
-                                'modified': note_data['modified']
-                            })
-
-                        elif reply_type.endswith('Official_Comment') or reply_type.endswith('Rebuttal') or any(key in content for key in ['comment', 'rebuttal']):
-                            paper_info['comments'].append({
-                                'comment_id': note.id,
-                                'invitation': invitation,
-                                'comment': content.get('comment', content.get('rebuttal', '')),
-                                'title': content.get('title', ''),
-                                'full_content': content,
-                                'created': note_data['created'],
-                                'modified': note_data['modified']
-                            })
-                        else:
-                            paper_info['comments'].append(note_data)
+                        add_reply(paper_info, note_to_reply(note, note_accessors))
 
                 except Exception as e:
                     print(f"  ✗ Error fetching notes: {e}")
@@ -278,46 +391,51 @@ def crawl_first_50_papers(year=2024, limit=500):
                   f"{len(paper_info['comments'])} comments, "
                   f"decision: {paper_info['decision']}")
 
-            papers.append(paper_info)
-
-            # Rate limiting
-            time.sleep(0.3)
-
         except Exception as e:
             print(f"  ✗ Error processing paper: {e}")
             continue
 
-    return papers
+        yield paper_info
 
 
 def save_to_json(papers, filename=None):
-    """Save papers to JSON file"""
+    """Stream papers to a JSON file as they arrive
+
+    Metadata totals are accumulated while writing and stored after the papers list.
+
+    Returns:
+        The output filename, or None if there were no papers to save
+    """
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"iclr_first_50_papers_{timestamp}.json"
-    
-    # Create output structure
-    output = {
-        'metadata': {
-            'crawled_at': datetime.now().isoformat(),
-            'total_papers': len(papers),
-            'total_reviews': sum(len(p['reviews']) for p in papers),
-            'total_comments': sum(len(p['comments']) for p in papers),
-        },
-        'papers': papers
-    }
-    
-    # Save to file
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False, default=str)
+
+    totals = {'total_papers': 0, 'total_reviews': 0, 'total_comments': 0}
+
+    def counted(papers):
+        for p in papers:
+            totals['total_papers'] += 1
+            totals['total_reviews'] += len(p['reviews'])
+            totals['total_comments'] += len(p['comments'])
+            yield p
+
+    def metadata():
+        return {'crawled_at': datetime.now().isoformat(), **totals}
+
+    # Save to file, serializing one paper at a time
+    write_papers(filename, counted(papers), metadata=metadata, default=str)
+
+    if not totals['total_papers']:
+        os.remove(filename)
+        return None
     
     print(f"\n{'='*70}")
     print(f"✓ Saved to: {filename}")
     print(f"{'='*70}")
-    print(f"Total papers: {output['metadata']['total_papers']}")
-    print(f"Total reviews: {output['metadata']['total_reviews']}")
-    print(f"Total comments: {output['metadata']['total_comments']}")
-    print(f"Average reviews per paper: {output['metadata']['total_reviews'] / len(papers):.2f}")
+    print(f"Total papers: {totals['total_papers']}")
+    print(f"Total reviews: {totals['total_reviews']}")
+    print(f"Total comments: {totals['total_comments']}")
+    print(f"Average reviews per paper: {totals['total_reviews'] / totals['total_papers']:.2f}")
     print(f"{'='*70}\n")
     
     return filename
@@ -329,12 +447,10 @@ if __name__ == "__main__":
     LIMIT = 50
     OUTPUT_FILE = "iclr_2024_first_50_papers.json"
     
-    # Crawl papers
+    # Crawl papers, writing each one to JSON as soon as it is ready
     papers = crawl_first_50_papers(year=YEAR, limit=LIMIT)
     
-    if papers:
-        # Save to JSON
-        save_to_json(papers, OUTPUT_FILE)
+    if save_to_json(papers, OUTPUT_FILE):
         print("✓ Done!")
     else:
         print("✗ No papers crawled")
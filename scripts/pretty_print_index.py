@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config_cache import load_config
+from src.storage_manager import StorageManager
+from src.utils.json_io import dumps
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pretty-print the papers index, which is stored compact")
+    parser.add_argument('--output', help='Write the indented index to this file instead of stdout')
+    args = parser.parse_args()
+
+    config = load_config()
+    storage = StorageManager(config['storage']['base_dir'])
+
+    index_path = storage.get_index_path()
+    if not index_path.exists():
+        print(f"Index does not exist: {index_path}", file=sys.stderr)
+        sys.exit(1)
+
+    data = dumps(storage.load_index()) + b'\n'
+    if args.output:
+        Path(args.output).write_bytes(data)
+        print(f"Indented index written to: {args.output}")
+    else:
+        sys.stdout.buffer.write(data)
+
+if __name__ == "__main__":
+    main()
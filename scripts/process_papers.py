@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
-import json
-import yaml
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 import sys
 from tqdm import tqdm
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.processor import PaperProcessor
+from src.config_cache import load_config
+from src.processor import PaperProcessor, ResultStatus, STATUS_IDX, results_by_status
+from src.utils.json_io import iter_papers, write_json
 
 def setup_logging(config):
     log_level = getattr(logging, config['logging']['level'])
@@ -24,27 +27,31 @@ def setup_logging(config):
     Path(log_file).parent.mkdir(exist_ok=True)
 
     # Configure logging
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handlers = [logging.FileHandler(log_file)]
     if config['logging']['console']:
         handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers
-    )
+    # Workers only enqueue records; a single listener thread does the file and console writes
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    return listener
 
 def load_input_papers(input_path: str):
-    """Load papers from input JSON file"""
-    with open(input_path, 'r', encoding='utf-8') as f:
-        papers = json.load(f)
-    return papers
+    """Stream papers from input JSON file one at a time"""
+    return iter_papers(input_path)
 
 def main():
     # Load config
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config()
 
     setup_logging(config)
     logger = logging.getLogger(__name__)
@@ -57,33 +64,31 @@ def main():
     input_json = config['storage']['input_json']
     logger.info(f"Loading papers from: {input_json}")
     papers = load_input_papers(input_json)
-    logger.info(f"Loaded {len(papers)} papers")
 
     # Initialize processor
     processor = PaperProcessor(config)
 
     # Process papers
-    results = {
-        "completed": [],
-        "failed_download": [],
-        "failed_conversion": [],
-        "skipped": []
-    }
+    ids_by_status = [[] for _ in ResultStatus]
+
+    total_papers = 0
 
     logger.info("Starting paper processing...")
-    for paper in tqdm(papers, desc="Processing papers"):
-        result = processor.process_paper(paper)
+    for result in tqdm(processor.process_papers(papers), desc="Processing papers", smoothing=0.1):
+        total_papers += 1
+        idx = STATUS_IDX.get(result['status'])
+        if idx is not None:
+            ids_by_status[idx].append(result['paper_id'])
 
-        status = result['status']
-        if status in results:
-            results[status].append(result['paper_id'])
+    results = results_by_status(ids_by_status)
 
     # Print summary
     logger.info("="*60)
     logger.info("Processing Summary:")
-    logger.info(f"  Total papers: {len(papers)}")
+    logger.info(f"  Total papers: {total_papers}")
     logger.info(f"  Completed: {len(results['completed'])}")
     logger.info(f"  Skipped (already processed): {len(results['skipped'])}")
+    logger.info(f"  Unchanged (PDF not modified): {len(results['unchanged'])}")
     logger.info(f"  Failed (download): {len(results['failed_download'])}")
     logger.info(f"  Failed (conversion): {len(results['failed_conversion'])}")
     logger.info("="*60)
@@ -91,14 +96,13 @@ def main():
     # Save processing summary
     summary_path = Path(config['storage']['base_dir']) / "index" / "processing_summary.json"
     summary_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "total_papers": len(papers),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        "total_papers": total_papers,
         "results": results,
         "config": config
     }
 
-    with open(summary_path, 'w') as f:
-        json.dump(summary_data, f, indent=2)
+    write_json(summary_path, summary_data)
 
     logger.info(f"Processing summary saved to: {summary_path}")
 
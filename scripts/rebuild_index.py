@@ -1,20 +1,19 @@
 #!/usr/bin/env python3
 import json
-import yaml
+import os
+from collections import Counter
 from pathlib import Path
 import sys
 from tqdm import tqdm
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.config_cache import load_config
 from src.storage_manager import StorageManager
 
-def load_config():
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+NOW_ISO = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
 
 def rebuild_index(config):
     """Rebuild the papers index from existing files"""
@@ -25,7 +24,7 @@ def rebuild_index(config):
     # Start with empty index
     index = {
         'total_papers': 0,
-        'last_updated': datetime.utcnow().isoformat() + "Z",
+        'last_updated': NOW_ISO,
         'papers': {},
         'stats': {
             'total': 0,
@@ -43,20 +42,24 @@ def rebuild_index(config):
         print(f"Papers directory does not exist: {papers_dir}")
         return
 
-    # Scan existing paper directories
-    paper_dirs = list(papers_dir.iterdir())
-    paper_dirs = [d for d in paper_dirs if d.is_dir()]
+    # Scan existing paper directories; DirEntry.is_dir uses the type readdir
+    # already returned instead of a stat() per entry
+    with os.scandir(papers_dir) as it:
+        paper_dirs = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
 
     print(f"Found {len(paper_dirs)} paper directories")
 
-    for paper_dir in tqdm(paper_dirs, desc="Scanning papers"):
-        paper_id = paper_dir.name
+    # Status counts are kept while scanning rather than in a second pass
+    status_counts = Counter()
+    for entry in tqdm(paper_dirs, desc="Scanning papers"):
+        paper_id = entry.name
 
-        # Check what files exist
-        exists = storage.paper_exists(paper_id)
+        # Check what files exist with one directory read
+        exists = storage.scan_paper_dir(paper_id)
 
         # Try to load paper data
-        paper_data = storage.load_paper_json(paper_id)
+        json_entry = exists['json_entry']
+        paper_data = storage.load_paper_json_from_entry(json_entry) if json_entry else None
 
         if paper_data:
             # Use data from JSON file
@@ -89,12 +92,9 @@ def rebuild_index(config):
             'has_markdown': exists['markdown'],
             'decision': decision
         }
+        status_counts[status] += 1
 
     # Calculate stats
-    status_counts = {}
-    for paper in index['papers'].values():
-        status_counts[paper['status']] = status_counts.get(paper['status'], 0) + 1
-
     stats = index['stats']
     stats['total'] = len(index['papers'])
     stats['completed'] = status_counts.get('completed', 0)
@@ -105,8 +105,8 @@ def rebuild_index(config):
     # Save index
     storage.save_index(index)
 
-    print("
-Index rebuilt:"    print(f"  Total papers: {stats['total']}")
+    print("\nIndex rebuilt:")
+    print(f"  Total papers: {stats['total']}")
     print(f"  Completed: {stats['completed']}")
     print(f"  PDFs only: {status_counts.get('pdf_downloaded', 0)}")
     print(f"  Unknown status: {status_counts.get('unknown', 0)}")
@@ -1,6 +1,4 @@
 #!/usr/bin/env python3
-import json
-import yaml
 import logging
 from pathlib import Path
 import sys
@@ -10,8 +8,12 @@ from datetime import datetime
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.processor import PaperProcessor
+from src.processor import PaperProcessor, ResultStatus, STATUS_IDX, results_by_status
+from src.config_cache import load_config
 from src.storage_manager import StorageManager
+from src.utils.json_io import iter_papers
+
+RETRY_STATUSES = frozenset(('failed_download', 'failed_conversion', 'pending'))
 
 def setup_logging(config):
     log_level = getattr(logging, config['logging']['level'])
@@ -36,26 +38,15 @@ def setup_logging(config):
 
 def load_failed_papers(input_path: str, storage: StorageManager):
     """Load papers that failed processing"""
-    with open(input_path, 'r', encoding='utf-8') as f:
-        all_papers = json.load(f)
-
-    failed_papers = []
     index = storage.load_index()
+    failed_ids = {paper_id for paper_id, meta in index['papers'].items()
+                  if meta.get('status') in RETRY_STATUSES}
 
-    for paper in all_papers:
-        paper_id = paper['paper_id']
-        paper_status = index['papers'].get(paper_id, {}).get('status', 'unknown')
-
-        if paper_status in ['failed_download', 'failed_conversion', 'pending']:
-            failed_papers.append(paper)
-
-    return failed_papers
+    return [paper for paper in iter_papers(input_path) if paper['paper_id'] in failed_ids]
 
 def main():
     # Load config
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config()
 
     setup_logging(config)
     logger = logging.getLogger(__name__)
@@ -79,20 +70,15 @@ def main():
         return
 
     # Process failed papers
-    results = {
-        "completed": [],
-        "failed_download": [],
-        "failed_conversion": [],
-        "skipped": []
-    }
+    ids_by_status = [[] for _ in ResultStatus]
 
     logger.info("Retrying failed papers...")
-    for paper in tqdm(failed_papers, desc="Retrying papers"):
-        result = processor.process_paper(paper)
+    for result in tqdm(processor.process_papers(failed_papers), total=len(failed_papers), desc="Retrying papers"):
+        idx = STATUS_IDX.get(result['status'])
+        if idx is not None:
+            ids_by_status[idx].append(result['paper_id'])
 
-        status = result['status']
-        if status in results:
-            results[status].append(result['paper_id'])
+    results = results_by_status(ids_by_status)
 
     # Print summary
     logger.info("="*60)
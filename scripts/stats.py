@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import json
-import yaml
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -8,13 +10,9 @@ from datetime import datetime
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.config_cache import load_config
 from src.storage_manager import StorageManager
 
-def load_config():
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
-
 def format_bytes(bytes_size):
     """Format bytes to human readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -23,6 +21,20 @@ def format_bytes(bytes_size):
         bytes_size /= 1024.0
     return f"{bytes_size:.1f} {unit}"
 
+# Directory walks are I/O-bound, so use more threads than cores
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def paper_file_sizes(paper_dir):
+    """Return (pdf_size, md_size) for a paper directory using one scandir"""
+    pdf_size = md_size = 0
+    with os.scandir(paper_dir) as entries:
+        for entry in entries:
+            if entry.name == 'paper.pdf':
+                pdf_size = entry.stat().st_size
+            elif entry.name == 'paper.md':
+                md_size = entry.stat().st_size
+    return pdf_size, md_size
+
 def main():
     config = load_config()
     storage = StorageManager(config['storage']['base_dir'])
@@ -33,7 +45,7 @@ def main():
 
     # Load index and log
     index = storage.load_index()
-    log_entries = storage.load_processing_log()
+    log_entries = storage.load_processing_log(cached=True)
 
     stats = index['stats']
 
@@ -53,30 +65,25 @@ def main():
     print("\nProcessing Log:")
     print(f"  Total log entries: {len(log_entries)}")
 
-    # Analyze log entries
-    stages = {}
+    # Analyze log entries in one pass: per stage [count, success, failed, total_duration]
+    stages = defaultdict(lambda: [0, 0, 0, 0])
     for entry in log_entries:
-        stage = entry['stage']
+        data = stages[entry['stage']]
         status = entry['status']
-        duration = entry.get('duration_seconds', 0)
-
-        if stage not in stages:
-            stages[stage] = {'count': 0, 'success': 0, 'failed': 0, 'total_duration': 0}
-
-        stages[stage]['count'] += 1
-        stages[stage]['total_duration'] += duration
+        data[0] += 1
+        data[3] += entry.get('duration_seconds', 0)
 
         if status == 'success':
-            stages[stage]['success'] += 1
-        elif status in ['failed', 'error']:
-            stages[stage]['failed'] += 1
+            data[1] += 1
+        elif status in ('failed', 'error'):
+            data[2] += 1
 
     print("\nStage Statistics:")
-    for stage, data in stages.items():
-        success_rate = data['success'] / data['count'] * 100 if data['count'] > 0 else 0
-        avg_duration = data['total_duration'] / data['count'] if data['count'] > 0 else 0
+    for stage, (count, success, failed, total_duration) in stages.items():
+        success_rate = success / count * 100 if count > 0 else 0
+        avg_duration = total_duration / count if count > 0 else 0
         print(f"  {stage}:")
-        print(f"    Count: {data['count']}")
+        print(f"    Count: {count}")
         print(f"    Success rate: {success_rate:.1f}%")
         print(f"    Average duration: {avg_duration:.2f}s")
 
@@ -88,16 +95,14 @@ def main():
 
     papers_dir = storage.papers_dir
     if papers_dir.exists():
-        for paper_dir in papers_dir.iterdir():
-            if paper_dir.is_dir():
-                pdf_path = storage.get_pdf_path(paper_dir.name)
-                md_path = storage.get_markdown_path(paper_dir.name)
-
-                if pdf_path.exists():
-                    total_pdf_size += pdf_path.stat().st_size
-                if md_path.exists():
-                    total_md_size += md_path.stat().st_size
-                paper_count += 1
+        with os.scandir(papers_dir) as entries:
+            paper_dirs = [entry.path for entry in entries if entry.is_dir()]
+
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            for pdf_size, md_size in executor.map(paper_file_sizes, paper_dirs):
+                total_pdf_size += pdf_size
+                total_md_size += md_size
+        paper_count = len(paper_dirs)
 
     print(f"  Papers processed: {paper_count}")
     print(f"  Total PDF size: {format_bytes(total_pdf_size)}")
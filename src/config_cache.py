@@ -0,0 +1,40 @@
+"""
+Cached loading of the project configuration file.
+
+The parsed config is memoized on the file's path and modification time, so
+repeated calls within a process are free while edits to config.yaml are
+still picked up.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import yaml
+
+# libyaml's C loader is much faster than the pure-Python SafeLoader when available
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "config.yaml"
+
+
+def load_config(config_path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """Load configuration from config.yaml, reusing the parsed result until the file changes.
+
+    The returned dict is shared between callers and should be treated as read-only.
+
+    Args:
+        config_path: Path to the YAML config (defaults to the repository's config.yaml)
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    path = Path(config_path or DEFAULT_CONFIG_PATH).resolve()
+    return _load_config(str(path), os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_Loader)
@@ -2,9 +2,15 @@
 
 import openreview
 import pandas as pd
-import json
-import time
-from typing import List, Dict
+import asyncio
+import csv
+import importlib.util
+import re
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
 import os
 import dotenv
 from datetime import datetime
@@ -12,14 +18,64 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.utils.logger import get_logger, log_crawl_start, log_crawl_progress, log_crawl_complete, log_error_with_context
-from src.schemas import Paper, Review, Comment, MetaReview, CrawlResult, create_paper_from_dict, create_crawl_result
+from src.schemas import (Paper, Review, Comment, MetaReview, CrawlResult, PAPER_LIST_ADAPTER,
+                         create_paper_from_dict, create_crawl_result)
+from src.utils.json_io import write_json, write_papers_jsonl
+from src.utils.rate_limiter import RateLimiter
 from pydantic import ValidationError
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# httpx only negotiates HTTP/2 when the optional h2 package is installed
+_HTTP2 = importlib.util.find_spec('h2') is not None
+
 dotenv.load_dotenv()
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Concurrent forum-note fetches and the request rate shared between them
+CRAWL_WORKERS = 8
+CRAWL_RATE = 5  # requests per second
+
+# Columns of the papers summary CSV
+CSV_FIELDS = ['paper_id', 'title', 'authors', 'num_reviews', 'avg_rating', 'decision', 'keywords', 'forum_url']
+
+# Venue-level reply invitations fetched in bulk and grouped by forum, and the
+# crawl size from which that is cheaper than one query per forum. These are all
+# the reply types _iter_paper_data files as reviews, meta reviews or comments;
+# other replies (withdrawals, desk rejections) carry none of the content it reads.
+NOTE_INVITATIONS = ['Official_Review', 'Meta_Review', 'Decision', 'Official_Comment',
+                    'Public_Comment', 'Rebuttal']
+BULK_NOTES_MIN_PAPERS = 100
+
+# Per-forum queries kept in flight on one event loop when httpx is installed,
+# and the page size of the notes endpoint
+ASYNC_CONCURRENCY = 32
+NOTES_PAGE_SIZE = 1000
+# Retries of one notes request after a 429, timeout, connection error or 5xx
+# before it fails, and the backoff before the first non-429 retry (doubled after each)
+MAX_FETCH_RETRIES = 5
+FETCH_RETRY_DELAY = 1.0
+
+# Papers validated per pydantic-core call
+VALIDATE_BATCH = 32
+
+# Common acceptance and rejection indicators in ICLR decisions
+_ACCEPT_RE = re.compile(r'accept|oral|poster|spotlight|notable|top|best', re.IGNORECASE)
+_REJECT_RE = re.compile(r'reject|withdraw', re.IGNORECASE)
+
+# Content keys used to categorize forum notes
+_REVIEW_KEYS = frozenset(('rating', 'confidence', 'review', 'recommendation'))
+_META_KEYS = frozenset(('decision', 'recommendation'))
+_COMMENT_KEYS = frozenset(('comment', 'rebuttal'))
+
+# Leading number of a rating such as "6: Weak Accept", "6" or "6.0"
+RATING_NUMBER = r'^\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*(?::|$)'
+
 
 def get_openreview_client():
     """
@@ -61,32 +117,199 @@ def is_accepted_paper(decision):
     if not decision:
         return False
     
-    decision_lower = str(decision).lower()
+    # Check for rejection first ('desk reject' is covered by 'reject')
+    decision = str(decision)
+    return not _REJECT_RE.search(decision) and bool(_ACCEPT_RE.search(decision))
+
+
+def extract_note_content(note) -> Dict:
+    """Flatten a note's content, unwrapping API v2 {'value': ...} fields"""
+    content = {}
+    for key, val in note.content.items():
+        if isinstance(val, dict) and 'value' in val:
+            content[key] = val['value']
+        else:
+            content[key] = val
+    return content
+
+
+def fetch_forum_notes(client, api_version: str, forum_id: str, limiter: RateLimiter):
+    """Fetch all notes of a forum once the shared rate limiter allows it"""
+    limiter.acquire()
+    if api_version == 'v2':
+        return list(client.get_all_notes(forum=forum_id))
+    return client.get_all_notes(forum=forum_id)
+
+
+def prefetch_forum_notes(client, api_version: str, submissions: List, max_workers: int,
+                         known: Optional[Dict[str, List]] = None):
+    """Yield (index, paper, notes future) in submission order while fetching ahead concurrently
+
+    Only a bounded window of fetches is in flight, so a caller that stops early
+    (e.g. on reaching its limit) does not fetch every forum. Closing the generator
+    cancels fetches that have not started yet.
+
+    Args:
+        known: Notes already fetched, keyed by forum id; those forums are not queried again
+    """
+    limiter = RateLimiter(CRAWL_RATE)
+    window = deque()
+    known = known or {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for i, paper in enumerate(submissions, 1):
+                forum_id = paper.forum if hasattr(paper, 'forum') else paper.id
+                if forum_id in known:
+                    future = _resolved(known[forum_id])
+                else:
+                    future = executor.submit(fetch_forum_notes, client, api_version, forum_id, limiter)
+                window.append((i, paper, future))
+                if len(window) >= max_workers * 2:
+                    yield window.popleft()
+
+            while window:
+                yield window.popleft()
+        finally:
+            for _, _, future in window:
+                future.cancel()
+
+
+def fetch_notes_by_invitation(client, year: int) -> Optional[Dict[str, List]]:
+    """Fetch reply notes for the whole venue with a few invitation-level queries
+
+    Only the replies posted under NOTE_INVITATIONS are returned. They cover
+    every reply type _iter_paper_data categorises, so a forum's reviews, meta
+    reviews and comments match what a per-forum query yields; callers should
+    still query forums without a review in the result individually.
+
+    Returns:
+        Notes grouped by forum id, or None if the venue has no venue-level
+        Official_Review invitation (reviews then live under per-paper
+        invitations and callers fall back to per-forum queries)
+    """
+    notes_by_forum = defaultdict(list)
     
-    # Common acceptance indicators for ICLR
-    accepted_keywords = [
-        'accept', 'oral', 'poster', 'spotlight', 'notable', 'top', 'best'
-    ]
+    for name in NOTE_INVITATIONS:
+        invitation = f'ICLR.cc/{year}/Conference/-/{name}'
+        try:
+            notes = list(client.get_all_notes(invitation=invitation))
+        except Exception as e:
+            logger.debug(f"Invitation-level query failed for {invitation}: {e}")
+            notes = []
+        
+        if name == 'Official_Review' and not notes:
+            logger.debug(f"No venue-level reviews under {invitation}; using per-forum queries")
+            return None
+        
+        for note in notes:
+            notes_by_forum[note.forum].append(note)
     
-    # Reject indicators to be sure
-    rejected_keywords = [
-        'reject', 'desk reject', 'withdraw'
-    ]
+    return notes_by_forum
+
+
+def _has_review(notes: List) -> bool:
+    """Whether any note looks like a review, by the same content keys _iter_paper_data uses"""
+    return any(not _REVIEW_KEYS.isdisjoint(extract_note_content(note).keys()) for note in notes)
+
+
+async def _get_notes_page(session, params: Dict, limiter: RateLimiter) -> List[Dict]:
+    """GET one page from the notes endpoint, retrying rate limits and transient failures
+
+    A 429 slows the shared limiter before retrying; timeouts, connection errors
+    and 5xx responses are retried after an exponential backoff. The error is
+    raised once MAX_FETCH_RETRIES retries have failed.
+    """
+    for attempt in range(MAX_FETCH_RETRIES + 1):
+        while wait := limiter.try_acquire():
+            await asyncio.sleep(wait)
+        
+        last_attempt = attempt == MAX_FETCH_RETRIES
+        try:
+            response = await session.get('/notes', params=params)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code == 429 and not last_attempt:
+                limiter.slow_down()
+                continue
+            if response.status_code < 500 or last_attempt:
+                response.raise_for_status()
+                limiter.record_success()
+                return response.json()['notes']
+        
+        await asyncio.sleep(FETCH_RETRY_DELAY * 2 ** attempt)
+
+
+async def fetch_notes(session, forum_id: str, limiter: RateLimiter) -> List:
+    """Fetch all notes of a forum from the API v2 notes endpoint, following pagination"""
+    notes = []
+    offset = 0
+    while True:
+        page = await _get_notes_page(session, {
+            'forum': forum_id, 'limit': NOTES_PAGE_SIZE, 'offset': offset}, limiter)
+        notes.extend(openreview.api.Note.from_json(n) for n in page)
+        if len(page) < NOTES_PAGE_SIZE:
+            return notes
+        offset += len(page)
+
+
+async def _fetch_forums_async(client, forum_ids: List[str], concurrency: int) -> Dict[str, List]:
+    limiter = RateLimiter(CRAWL_RATE)
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {'Authorization': f'Bearer {client.token}'} if getattr(client, 'token', None) else {}
     
-    # Check for rejection first
-    for reject_word in rejected_keywords:
-        if reject_word in decision_lower:
-            return False
+    async def bound_fetch(session, forum_id):
+        async with semaphore:
+            return await fetch_notes(session, forum_id, limiter)
     
-    # Check for acceptance
-    for accept_word in accepted_keywords:
-        if accept_word in decision_lower:
-            return True
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=client.baseurl, headers=headers, limits=limits,
+                                 http2=_HTTP2, timeout=30) as session:
+        results = await asyncio.gather(*(bound_fetch(session, f) for f in forum_ids),
+                                       return_exceptions=True)
     
-    return False
+    notes_by_forum = {}
+    for forum_id, result in zip(forum_ids, results):
+        if isinstance(result, BaseException):
+            logger.debug(f"Async fetch failed for forum {forum_id}: {result}")
+        else:
+            notes_by_forum[forum_id] = result
+    
+    failed = len(forum_ids) - len(notes_by_forum)
+    if failed:
+        logger.warning(f"{failed} forums could not be fetched asynchronously; fetching them individually")
+    return notes_by_forum
+
+
+def fetch_forums_async(client, forum_ids: List[str],
+                       concurrency: int = ASYNC_CONCURRENCY) -> Dict[str, List]:
+    """Fetch notes of many forums concurrently on one asyncio event loop
 
+    openreview-py is only used for its auth token; requests go straight to the
+    API v2 notes endpoint over a shared keep-alive (HTTP/2 when h2 is installed)
+    connection pool.
 
-def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit: int = None):
+    Returns:
+        Notes keyed by forum id; forums whose fetch still failed after retries
+        are left out, so callers can query them again
+    """
+    return asyncio.run(_fetch_forums_async(client, forum_ids, concurrency))
+
+
+def _resolved(value) -> Future:
+    """Wrap an already-known value in a completed Future (an exception is set as its error)"""
+    future = Future()
+    if isinstance(value, BaseException):
+        future.set_exception(value)
+    else:
+        future.set_result(value)
+    return future
+
+
+def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit: int = None,
+                                  max_workers: int = CRAWL_WORKERS):
     """
     Crawl papers and reviews from ICLR conference
     
@@ -94,6 +317,22 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
         year: Conference year (e.g., 2024, 2023, 2022)
         accepted_only: If True, only return accepted papers
         limit: Maximum number of papers to crawl (None for all papers)
+        max_workers: Number of forums whose notes are fetched concurrently
+    """
+    return list(iter_iclr_papers_and_reviews(year, accepted_only, limit, max_workers))
+
+
+def iter_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit: int = None,
+                                 max_workers: int = CRAWL_WORKERS):
+    """
+    Crawl papers and reviews from ICLR conference, yielding each validated
+    Paper as soon as it is ready so callers can stream results to disk
+    
+    Args:
+        year: Conference year (e.g., 2024, 2023, 2022)
+        accepted_only: If True, only return accepted papers
+        limit: Maximum number of papers to crawl (None for all papers)
+        max_workers: Number of forums whose notes are fetched concurrently
     """
     client, api_version = get_openreview_client()
     
@@ -129,19 +368,124 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
         logger.error(f"  2. The venue uses a different invitation format")
         logger.error(f"Try visiting: https://openreview.net/group?id=ICLR.cc/{year}/Conference")
         logger.error(f"Or try a different year like {year-1} or {year-2}")
-        return []
+        return
     
     logger.info(f"Processing {len(submissions)} papers from {used_pattern}")
     
-    valid_papers: List[Paper] = []
+    # For large crawls a handful of venue-wide queries beat one query per forum;
+    # forums not covered by them are still fetched one by one below
+    known = None
+    wanted = min(limit, len(submissions)) if limit else len(submissions)
+    if wanted >= BULK_NOTES_MIN_PAPERS:
+        notes_by_forum = fetch_notes_by_invitation(client, year)
+        if notes_by_forum is not None:
+            logger.info(f"Fetched notes for {len(notes_by_forum)} forums with invitation-level queries")
+            # Forums whose reviews live under other invitations are queried individually
+            known = {forum_id: notes for forum_id, notes in notes_by_forum.items() if _has_review(notes)}
+            # accepted_only may scan past the first `wanted` submissions to find enough
+            scanned = submissions if accepted_only else submissions[:wanted]
+            missing = sum(1 for paper in scanned
+                          if (paper.forum if hasattr(paper, 'forum') else paper.id) not in known)
+            if missing:
+                logger.warning(f"{missing} forums had no reviews in the invitation-level results; "
+                               f"fetching them individually")
+        elif httpx is not None and api_version == 'v2' and not (accepted_only and limit):
+            # Without venue-level invitations, fetch every wanted forum on one event loop.
+            # How many forums accepted_only with a limit needs is unknown up front, so
+            # those crawls keep the bounded window of prefetch_forum_notes instead.
+            forum_ids = [paper.forum if hasattr(paper, 'forum') else paper.id for paper in submissions[:wanted]]
+            known = fetch_forums_async(client, forum_ids)
+            logger.info(f"Fetched notes for {len(known)} forums asynchronously")
+    
+    fetches = prefetch_forum_notes(client, api_version, submissions, max_workers, known=known)
+    
     invalid_papers: List[Dict[str, str]] = []
+    with closing(fetches):
+        yield from _iter_papers(fetches, len(submissions), accepted_only, limit, invalid_papers)
     
-    for i, paper in enumerate(submissions, 1):
+    if invalid_papers:
+        logger.warning(f"Skipped {len(invalid_papers)} papers due to validation errors or fetch issues.")
+        logger.debug(f"Skipped paper details: {invalid_papers}")
+
+
+def _iter_papers(fetches, total: int, accepted_only: bool, limit: int,
+                 invalid_papers: List[Dict[str, str]]):
+    """Build and validate papers from prefetched forum notes, yielding them in submission order
+
+    Papers are validated in batches of up to VALIDATE_BATCH with a single
+    pydantic-core call; near the limit batches shrink so no extra forums are
+    fetched. Papers that fail to fetch or validate are recorded in invalid_papers.
+    """
+    valid_count = 0
+    paper_data_iter = _iter_paper_data(fetches, total, invalid_papers)
+    
+    while True:
+        batch_size = min(VALIDATE_BATCH, limit - valid_count) if limit else VALIDATE_BATCH
+        batch = list(islice(paper_data_iter, batch_size))
+        if not batch:
+            return
+        
+        for paper_obj in _validate_papers(batch, invalid_papers):
+            # Filter for accepted papers if requested
+            if accepted_only:
+                if not is_accepted_paper(paper_obj.decision):
+                    logger.debug(f"Rejected/withdrawn paper skipped: {paper_obj.title[:50]}...")
+                    continue
+                logger.debug(f"Accepted paper included: {paper_obj.title[:50]}...")
+            
+            yield paper_obj
+            valid_count += 1
+            
+            # Check if we've reached the limit
+            if limit and valid_count >= limit:
+                logger.info(f"\n✓ Reached limit of {limit} papers. Stopping crawl.")
+                return
+
+
+def _validate_papers(batch, invalid_papers: List[Dict[str, str]]) -> List[Paper]:
+    """Validate a batch of (paper, paper_data) pairs into Paper objects
+
+    The whole batch goes through PAPER_LIST_ADAPTER in one call; if any entry
+    is invalid, fall back to validating one by one to isolate the failures.
+    """
+    try:
+        papers = PAPER_LIST_ADAPTER.validate_python([paper_data for _, paper_data in batch])
+    except Exception:
+        pass
+    else:
+        for paper_obj in papers:
+            logger.debug(f"✓ Paper validated: {paper_obj.title[:50]}...")
+        return papers
+    
+    valid_papers = []
+    for paper, paper_data in batch:
+        try:
+            paper_obj = create_paper_from_dict(paper_data)
+            logger.debug(f"✓ Paper validated: {paper_obj.title[:50]}...")
+        except (ValidationError, Exception) as e:
+            log_error_with_context(e, f"validating paper {paper.id}")
+            invalid_papers.append({
+                "paper_id": paper.id,
+                "forum_id": paper_data.get("forum_id"),
+                "title": paper_data.get("title"),
+                "error": str(e)
+            })
+            continue
+        valid_papers.append(paper_obj)
+    return valid_papers
+
+
+def _iter_paper_data(fetches, total: int, invalid_papers: List[Dict[str, str]]):
+    """Yield (paper, paper_data) for each submission whose forum notes were fetched
+
+    Papers whose notes could not be fetched are recorded in invalid_papers.
+    """
+    for i, paper, notes_future in fetches:
         title = paper.content.get('title', {})
         if isinstance(title, dict):
             title = title.get('value', 'No title')
         
-        log_crawl_progress(i, len(submissions), str(title)[:60])
+        log_crawl_progress(i, total, str(title)[:60])
         
         # Extract paper information (handle both v1 and v2 formats)
         def get_value(content_dict, key):
@@ -161,14 +505,9 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
             'forum_url': f"https://openreview.net/forum?id={paper.forum if hasattr(paper, 'forum') else paper.id}",
         }
         
-        # Get all notes for this paper (reviews, comments, etc.)
-        forum_id = paper.forum if hasattr(paper, 'forum') else paper.id
-        
         try:
-            if api_version == 'v2':
-                notes = list(client.get_all_notes(forum=forum_id))
-            else:
-                notes = client.get_all_notes(forum=forum_id)
+            # All notes for this paper (reviews, comments, etc.), fetched ahead
+            notes = notes_future.result()
             
             reviews = []
             comments = []
@@ -181,27 +520,17 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
                     continue
                 
                 invitation = note.invitation if hasattr(note, 'invitation') else ''
-                invitation_lower = str(invitation).lower()
                 
                 # DEBUG: Print invitation patterns we're seeing
                 if i <= 3:  # Only for first few papers to avoid spam
                     logger.debug(f"Note content keys: {list(note.content.keys())[:5]}")  # First 5 keys
                 
-                # Extract content
-                def extract_content(note):
-                    content = {}
-                    for key, val in note.content.items():
-                        if isinstance(val, dict) and 'value' in val:
-                            content[key] = val['value']
-                        else:
-                            content[key] = val
-                    return content
-                
-                note_content = extract_content(note)
+                note_content = extract_note_content(note)
+                content_keys = note_content.keys()
                 
                 # Categorize the note based on content rather than invitation
                 # Check if this looks like a review
-                if any(key in note_content for key in ['rating', 'confidence', 'review', 'recommendation']):
+                if not _REVIEW_KEYS.isdisjoint(content_keys):
                     review_data = {
                         'review_id': note.id,
                         'invitation': invitation,
@@ -220,7 +549,7 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
                     reviews.append(review_data)
                     
                 # Check if this looks like a decision/meta-review
-                elif any(key in note_content for key in ['decision', 'recommendation']) and 'rating' not in note_content:
+                elif not _META_KEYS.isdisjoint(content_keys) and 'rating' not in content_keys:
                     decision = note_content.get('decision', note_content.get('recommendation', ''))
                     meta_reviews.append({
                         'id': note.id,
@@ -229,7 +558,7 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
                     })
                     
                 # Check if this looks like a comment
-                elif any(key in note_content for key in ['comment', 'rebuttal']):
+                elif not _COMMENT_KEYS.isdisjoint(content_keys):
                     comments.append({
                         'note_id': note.id,
                         'invitation': invitation,
@@ -245,20 +574,6 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
             
             logger.info(f"Found {len(reviews)} reviews, {len(comments)} comments, decision: {decision}")
             
-            # Validate and create Paper object using Pydantic schema
-            try:
-                paper_obj = create_paper_from_dict(paper_data)
-                logger.debug(f"✓ Paper validated: {paper_obj.title[:50]}...")
-            except (ValidationError, Exception) as e:
-                log_error_with_context(e, f"validating paper {paper.id}")
-                invalid_papers.append({
-                    "paper_id": paper.id,
-                    "forum_id": paper_data.get("forum_id"),
-                    "title": str(title),
-                    "error": str(e)
-                })
-                continue
-            
         except Exception as e:
             log_error_with_context(e, f"fetching notes for paper {paper.id}")
             paper_data['reviews'] = []
@@ -274,29 +589,70 @@ def crawl_iclr_papers_and_reviews(year: int, accepted_only: bool = False, limit:
             })
             continue
         
-        # Filter for accepted papers if requested
-        if accepted_only:
-            if is_accepted_paper(paper_obj.decision):
-                valid_papers.append(paper_obj)
-                logger.debug(f"Accepted paper included: {title[:50]}...")
-            else:
-                logger.debug(f"Rejected/withdrawn paper skipped: {title[:50]}...")
-        else:
-            valid_papers.append(paper_obj)
-        
-        # Rate limiting
-        time.sleep(0.3)
-        
-        # Check if we've reached the limit
-        if limit and len(valid_papers) >= limit:
-            logger.info(f"\n✓ Reached limit of {limit} papers. Stopping crawl.")
-            break
+        yield paper, paper_data
+
+
+def average_ratings(papers_dicts: List[Dict]) -> Dict[str, float]:
+    """Average numeric review rating per paper_id, skipping papers without one
+
+    Ratings come in formats like "6: Weak Accept", "6" or 6.0; the number before
+    the colon is parsed for all reviews at once with pandas.
+    """
+    rows = []
+    for paper in papers_dicts:
+        for review in paper.get('reviews', []):
+            rating = review.get('rating', '') if isinstance(review, dict) else review.rating
+            rows.append((paper['paper_id'], str(rating)))
     
-    if invalid_papers:
-        logger.warning(f"Skipped {len(invalid_papers)} papers due to validation errors or fetch issues.")
-        logger.debug(f"Skipped paper details: {invalid_papers}")
+    reviews_df = pd.DataFrame(rows, columns=['paper_id', 'rating'], dtype=object)
+    reviews_df['num'] = reviews_df['rating'].str.extract(RATING_NUMBER, expand=False).astype(float)
+    ratings = reviews_df.dropna(subset=['num'])
+    return ratings.groupby('paper_id')['num'].mean().round(2).to_dict()
+
+
+def save_data_jsonl(papers: Iterable[Paper], year: int, accepted_only: bool = False):
+    """Stream papers to JSON Lines as they are crawled
     
-    return valid_papers
+    Each paper is written on its own line as soon as it arrives, so memory stays
+    at one paper and an interrupted crawl keeps what it has written. Crawl-level
+    details and totals go to a small header file written at the end.
+    
+    Args:
+        papers: Paper objects, typically from iter_iclr_papers_and_reviews
+        year: Conference year
+        accepted_only: Whether only accepted papers were crawled
+    
+    Returns:
+        dict: The header written alongside the papers
+    """
+    suffix = "_accepted" if accepted_only else ""
+    jsonl_filename = f'iclr_{year}_papers_reviews{suffix}.jsonl'
+    header_filename = f'iclr_{year}_header{suffix}.json'
+    
+    totals = {'total_reviews': 0, 'total_comments': 0}
+    
+    def counted(papers):
+        for paper in papers:
+            totals['total_reviews'] += len(paper.reviews)
+            totals['total_comments'] += len(paper.comments)
+            yield paper
+    
+    total_papers = write_papers_jsonl(jsonl_filename, counted(papers))
+    logger.info(f"Saved {total_papers} papers to {jsonl_filename}")
+    
+    header = {
+        'venue': 'ICLR',
+        'year': year,
+        'accepted_only': accepted_only,
+        'crawled_at': datetime.now().isoformat(),
+        'papers_file': jsonl_filename,
+        'total_papers': total_papers,
+        **totals,
+    }
+    write_json(header_filename, header)
+    logger.info(f"Saved crawl header to {header_filename}")
+    
+    return header
 
 
 def save_data(data: List, year: int, accepted_only: bool = False):
@@ -333,49 +689,25 @@ def save_data(data: List, year: int, accepted_only: bool = False):
     json_filename = f'iclr_{year}_papers_reviews{suffix}.json'
     
     if crawl_result:
-        # Save validated CrawlResult
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(crawl_result.model_dump(), f, indent=2, ensure_ascii=False, default=str)
+        # Save validated CrawlResult; pydantic-core serializes straight to JSON
+        # bytes without building an intermediate dict
+        with open(json_filename, 'wb') as f:
+            f.write(crawl_result.model_dump_json(indent=2).encode('utf-8'))
         logger.info(f"Saved validated CrawlResult to {json_filename}")
-        papers_data = crawl_result.papers
+        # Dump every paper in one call for the CSV rows below
+        papers_dicts = crawl_result.model_dump(include={'papers'})['papers']
     else:
         # Fall back to raw data
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        write_json(json_filename, data, default=str)
         logger.info(f"Saved raw data to {json_filename}")
-        papers_data = data
+        papers_dicts = [paper.model_dump() if hasattr(paper, 'model_dump') else paper for paper in data]
+    
+    avg_ratings = average_ratings(papers_dicts)
     
     # Create a flattened version for CSV
     csv_data = []
-    for paper in papers_data:
-        # Handle both Paper objects and dictionaries
-        if hasattr(paper, 'model_dump'):
-            # It's a Paper object
-            paper_dict = paper.model_dump()
-        else:
-            # It's a raw dictionary
-            paper_dict = paper
-        
-        # Calculate average rating if reviews exist
-        ratings = []
-        for review in paper_dict.get('reviews', []):
-            if hasattr(review, 'model_dump'):
-                review_dict = review.model_dump()
-            else:
-                review_dict = review
-            
-            rating_str = str(review_dict.get('rating', ''))
-            if rating_str:
-                # Extract number from rating (various formats)
-                try:
-                    # Handle formats like "6: Weak Accept", "6", "6.0", etc.
-                    rating_clean = rating_str.split(':')[0].strip()
-                    rating_num = float(rating_clean)
-                    ratings.append(rating_num)
-                except:
-                    pass
-        
-        avg_rating = round(sum(ratings) / len(ratings), 2) if ratings else None
+    for paper_dict in papers_dicts:
+        avg_rating = avg_ratings.get(paper_dict['paper_id'])
         
         authors = paper_dict.get('authors', [])
         if isinstance(authors, list):
@@ -400,11 +732,16 @@ def save_data(data: List, year: int, accepted_only: bool = False):
             'forum_url': paper_dict.get('forum_url', '')
         })
     
-    # Save as CSV
-    df = pd.DataFrame(csv_data)
+    # Save as CSV, streaming rows through the C csv writer
     csv_filename = f'iclr_{year}_papers_summary{suffix}.csv'
-    df.to_csv(csv_filename, index=False, encoding='utf-8')
+    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(csv_data)
     logger.info(f"Saved summary to {csv_filename}")
+    
+    # DataFrame kept for callers that compute summary statistics from it
+    df = pd.DataFrame(csv_data, columns=CSV_FIELDS)
 
     return df, crawl_result
 
@@ -415,6 +752,7 @@ if __name__ == "__main__":
     YEAR = 2024  
     ACCEPTED_ONLY = False  # Set to True to only crawl accepted papers
     LIMIT = 50  # Limit to first 50 papers
+    STREAM_JSONL = False  # Set to True to stream papers to JSON Lines instead of JSON + CSV
     
     print(f"{'='*60}")
     print(f"ICLR {YEAR} Paper & Review Crawler")
@@ -427,6 +765,14 @@ if __name__ == "__main__":
     # Log the start of crawling
     log_crawl_start("ICLR", YEAR)
 
+    if STREAM_JSONL:
+        header = save_data_jsonl(
+            iter_iclr_papers_and_reviews(YEAR, accepted_only=ACCEPTED_ONLY, limit=LIMIT),
+            YEAR, accepted_only=ACCEPTED_ONLY
+        )
+        print(f"\nSaved {header['total_papers']} papers to {header['papers_file']}")
+        exit(0 if header['total_papers'] else 1)
+
     # Crawl the data
     data = crawl_iclr_papers_and_reviews(YEAR, accepted_only=ACCEPTED_ONLY, limit=LIMIT)
     
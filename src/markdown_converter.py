@@ -1,20 +1,102 @@
+import functools
+import itertools
 import logging
+import os
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
-from markitdown import MarkItDown
+import yaml
+
+from .utils.json_io import dumps
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader is much faster than the pure-Python SafeLoader when available
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Front-matter fields written by add_metadata_header, with their defaults
+_HEADER_FIELDS = (
+    ('title', 'Unknown Title'),
+    ('authors', []),
+    ('paper_id', ''),
+    ('forum_id', ''),
+    ('abstract', ''),
+    ('keywords', []),
+    ('pdf_url', ''),
+    ('forum_url', ''),
+    ('decision', ''),
+)
+_HEADER_TEMPLATE = "---\n" + "".join(f"{key}: {{{key}}}\n" for key, _ in _HEADER_FIELDS)
+
+# Converted-markdown cache size limit, and how many cache writes happen between eviction sweeps
+CACHE_MAX_BYTES = 2 << 30
+CACHE_SWEEP_EVERY = 50
+
+def _yaml_value(value: Any) -> str:
+    """Render a header value as JSON, which YAML reads back as the same value
+
+    Author and keyword lists are serialized by orjson when it is installed.
+    """
+    return dumps(value, indent=False, default=str).decode('utf-8')
+
+
+def _prefetch(path: Path) -> None:
+    """Ask the kernel to start reading path into the page cache ahead of MarkItDown
+
+    Raises:
+        FileNotFoundError: If path does not exist
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
 class MarkdownConverter:
-    def __init__(self):
-        self.markitdown = MarkItDown()
+    def __init__(self, cache_dir: Optional[Path] = None, cache_max_bytes: int = CACHE_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Directory of converted markdown keyed by PDF sha256;
+                None disables the cache
+            cache_max_bytes: Size above which least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.cache_max_bytes = cache_max_bytes
+        self._cache_writes = itertools.count(1)
+
+    @property
+    def markitdown(self):
+        return get_markitdown()
+
+    def convert_pdf_to_markdown(self, pdf_path: Path, paper_id: str,
+                                checksum: Optional[str] = None) -> Optional[str]:
+        """Convert PDF file to markdown using MarkItDown
+
+        Args:
+            pdf_path: PDF to convert
+            paper_id: Paper id, for logging
+            checksum: The PDF's sha256 (optionally prefixed "sha256:"); when
+                given, conversions are cached on it
+        """
+        cache_path = self._cache_path(checksum)
+        if cache_path is not None:
+            try:
+                markdown_content = cache_path.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                pass
+            else:
+                self._cache_touch(cache_path)
+                logger.info(f"Using cached markdown for {paper_id}")
+                return markdown_content
 
-    def convert_pdf_to_markdown(self, pdf_path: Path, paper_id: str) -> Optional[str]:
-        """Convert PDF file to markdown using MarkItDown"""
         try:
             logger.info(f"Converting PDF to markdown for {paper_id}")
 
-            if not pdf_path.exists():
+            try:
+                _prefetch(pdf_path)
+            except FileNotFoundError:
                 logger.error(f"PDF file not found: {pdf_path}")
                 return None
 
@@ -32,76 +114,135 @@ class MarkdownConverter:
                 return None
 
             logger.info(f"Successfully converted PDF to markdown for {paper_id} ({len(markdown_content)} chars)")
-            return markdown_content
 
         except Exception as e:
             logger.error(f"Error converting PDF for {paper_id}: {e}")
             return None
 
+        if cache_path is not None:
+            self._cache_store(cache_path, markdown_content)
+        return markdown_content
+
+    def _cache_path(self, checksum: Optional[str]) -> Optional[Path]:
+        if self.cache_dir is None or not checksum:
+            return None
+        digest = checksum.removeprefix('sha256:')
+        return self.cache_dir / digest[:2] / f"{digest}.md"
+
+    def _cache_store(self, cache_path: Path, markdown_content: str) -> None:
+        """Write a cache entry atomically; a failure only costs a future reconversion"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(markdown_content, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache markdown at {cache_path}: {e}")
+            return
+
+        if next(self._cache_writes) % CACHE_SWEEP_EVERY == 0:
+            self.evict_cache()
+
+    @staticmethod
+    def _cache_touch(cache_path: Path) -> None:
+        """Mark an entry as recently used by bumping its mtime
+
+        atime is not reliable for this (noatime and relatime mounts), so
+        evict_cache ranks entries by mtime instead.
+        """
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    def evict_cache(self) -> None:
+        """Delete least recently used cache entries until the cache fits in cache_max_bytes"""
+        if self.cache_dir is None:
+            return
+
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*/*.md'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= self.cache_max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.cache_max_bytes:
+                break
+
     def add_metadata_header(self, markdown_content: str, paper_data: Dict[str, Any]) -> str:
-        """Add metadata header to markdown content"""
-        header_lines = [
-            "---",
-            f"title: \"{paper_data.get('title', 'Unknown Title')}\"",
-            f"authors: {paper_data.get('authors', [])}",
-            f"paper_id: {paper_data.get('paper_id', '')}",
-            f"forum_id: {paper_data.get('forum_id', '')}",
-            f"abstract: \"{paper_data.get('abstract', '')}\"",
-            f"keywords: {paper_data.get('keywords', [])}",
-            f"pdf_url: {paper_data.get('pdf_url', '')}",
-            f"forum_url: {paper_data.get('forum_url', '')}",
-            f"decision: \"{paper_data.get('decision', '')}\"",
-        ]
+        """Add a YAML front-matter metadata header to markdown content"""
+        values = {key: _yaml_value(paper_data.get(key, default)) for key, default in _HEADER_FIELDS}
+        parts = [_HEADER_TEMPLATE.format_map(values)]
 
         # Add reviews summary if available
         reviews = paper_data.get('reviews', [])
         if reviews:
-            header_lines.append(f"num_reviews: {len(reviews)}")
+            parts.append(f"num_reviews: {len(reviews)}\n")
             ratings = [r.get('rating', 0) for r in reviews if r.get('rating')]
             if ratings:
-                avg_rating = sum(ratings) / len(ratings)
-                header_lines.append(f"average_rating: {avg_rating:.1f}")
-
-        header_lines.append("---")
-        header_lines.append("")  # Empty line after header
+                parts.append(f"average_rating: {sum(ratings) / len(ratings):.1f}\n")
 
-        header = "\n".join(header_lines)
-        return header + "\n" + markdown_content
+        parts.append("---\n\n")
+        parts.append(markdown_content)
+        return ''.join(parts)
 
     def extract_metadata_from_markdown(self, markdown_content: str) -> Dict[str, Any]:
-        """Extract metadata from markdown header (for validation)"""
-        lines = markdown_content.split('\n')
-        metadata = {}
+        """Extract metadata from the markdown front-matter header (for validation)"""
+        # Only the header is scanned; the (much longer) body is never split
+        if not markdown_content.startswith('---\n'):
+            return {}
 
-        if not lines or lines[0] != '---':
-            return metadata
+        end = markdown_content.find('\n---\n', 3)
+        if end == -1:
+            if not markdown_content.endswith('\n---'):
+                return {}
+            end = len(markdown_content) - 4
 
-        in_header = True
-        for line in lines[1:]:
-            if line == '---':
-                break
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                # Try to parse as JSON-like structures
-                if value.startswith('[') and value.endswith(']'):
-                    # List
-                    try:
-                        metadata[key] = eval(value)
-                    except:
-                        metadata[key] = value
-                elif value.startswith('"') and value.endswith('"'):
-                    # Quoted string
-                    metadata[key] = value[1:-1]
-                else:
-                    # Try to convert to number
-                    try:
-                        if '.' in value:
-                            metadata[key] = float(value)
-                        else:
-                            metadata[key] = int(value)
-                    except ValueError:
-                        metadata[key] = value
-
-        return metadata
+        try:
+            metadata = yaml.load(markdown_content[4:end], Loader=_Loader)
+        except yaml.YAMLError as e:
+            logger.warning(f"Invalid metadata header: {e}")
+            return {}
+
+        return metadata if isinstance(metadata, dict) else {}
+
+
+_markitdown = None
+_markitdown_lock = threading.Lock()
+
+
+def get_markitdown():
+    """Return the process-wide MarkItDown instance, creating it on first use.
+
+    Building MarkItDown imports all of its converters, so it is done once per
+    process (conversion worker processes build theirs in their initializer).
+    """
+    global _markitdown
+    if _markitdown is None:
+        with _markitdown_lock:
+            if _markitdown is None:
+                from markitdown import MarkItDown
+                _markitdown = MarkItDown()
+    return _markitdown
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_converter(cache_dir: Optional[Path]) -> MarkdownConverter:
+    return MarkdownConverter(cache_dir=cache_dir)
+
+
+def convert_in_worker(cache_dir: Optional[Path], pdf_path: Path, paper_id: str,
+                      checksum: Optional[str] = None) -> Optional[str]:
+    """convert_pdf_to_markdown for process pools; each worker process builds its converter once"""
+    return _worker_converter(cache_dir).convert_pdf_to_markdown(pdf_path, paper_id, checksum)
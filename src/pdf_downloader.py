@@ -1,51 +1,153 @@
+import functools
+import hashlib
+import os
+import random
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import logging
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, TypeVar, Union
+
+from .utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Keep-alive connections kept per host; at least as many as concurrent downloads
+# so finished connections are reused instead of dropped and reopened
+POOL_MAXSIZE = 64
+
+# Read size for response bodies; requests' own default (10 KB for .content)
+# means hundreds of Python-level reads per MB of PDF
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Upper bound on the exponential retry backoff, in seconds (before jitter)
+MAX_RETRY_DELAY = 60
+
+# Largest PDF accepted; larger responses are dropped before (or while) reading the body
+MAX_PDF_BYTES = 100 * 1024 * 1024
+
+# Returned by download_to_file when a conditional request gets HTTP 304
+NOT_MODIFIED = object()
+
+
+class DownloadedFile(NamedTuple):
+    """A PDF written by download_to_file"""
+    size_bytes: int
+    checksum: str  # sha256 hex digest
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
+def shared_session(pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Return the process-wide requests session for PDF downloads
+
+    All downloaders share its keep-alive connections, so DNS lookups and TLS
+    handshakes to openreview.net are not repeated per downloader.
+    """
+    session = requests.Session()
+
+    # Retries are handled by PDFDownloader, so the adapter never retries itself
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 class PDFDownloader:
     def __init__(self, timeout: int = 60, max_retries: int = 3,
-                 retry_delay: int = 5, user_agent: str = "OpenReview-Crawler/1.0"):
+                 retry_delay: int = 5, user_agent: str = "OpenReview-Crawler/1.0",
+                 pool_maxsize: int = POOL_MAXSIZE, max_bytes: int = MAX_PDF_BYTES,
+                 rate_limit: Optional[float] = None):
+        """
+        Args:
+            rate_limit: Requests per second shared by all threads using this
+                downloader; None for no limit
+        """
         self.timeout = timeout
+        self.max_bytes = max_bytes
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
+        # The session is shared, so per-downloader headers go on each request
+        self.session = shared_session(pool_maxsize)
+        self.headers = {'User-Agent': user_agent}
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
 
     def download(self, url: str, paper_id: str) -> Optional[bytes]:
         """Download PDF from URL with retry logic"""
+        return self._fetch(url, paper_id, lambda response: self._read_content(response, paper_id))
+
+    def download_to_file(self, url: str, paper_id: str, dest: Path, etag: Optional[str] = None,
+                         last_modified: Optional[str] = None) -> Union[DownloadedFile, object, None]:
+        """Stream a PDF straight to dest, hashing it on the way, with retry logic
+
+        Only one chunk is held in memory at a time. The body is written to a
+        temporary file next to dest and renamed into place once complete.
+
+        Args:
+            etag, last_modified: Validators from a previous download of url; when
+                given the request is conditional and an unchanged PDF is not sent
+
+        Returns:
+            The downloaded file's details, NOT_MODIFIED if the server reports the
+            PDF unchanged since the validators, or None if the download failed
+        """
+        conditional = {}
+        if etag:
+            conditional['If-None-Match'] = etag
+        if last_modified:
+            conditional['If-Modified-Since'] = last_modified
+
+        return self._fetch(url, paper_id, lambda response: self._write_content(response, paper_id, dest),
+                           conditional)
+
+    def _fetch(self, url: str, paper_id: str, read_body: Callable[[requests.Response], Optional[T]],
+               conditional: Optional[Dict[str, str]] = None) -> Union[T, object, None]:
+        """GET url with retries and return read_body(response), or None on failure
+
+        With conditional request headers, NOT_MODIFIED is returned on HTTP 304.
+        """
+        headers = {**self.headers, **conditional} if conditional else self.headers
 
         for attempt in range(self.max_retries + 1):
             try:
                 logger.info(f"Downloading PDF for {paper_id} from {url} (attempt {attempt + 1})")
 
-                response = self.session.get(url, timeout=self.timeout, stream=True)
-                response.raise_for_status()
+                # Closed on every exit, so error statuses also release the pooled connection
+                with self._get(url, headers) as response:
+                    response.raise_for_status()
 
-                # Check content type
-                content_type = response.headers.get('content-type', '').lower()
-                if 'pdf' not in content_type:
-                    logger.warning(f"Unexpected content type for {paper_id}: {content_type}")
+                    if response.status_code == 304:
+                        logger.info(f"PDF for {paper_id} not modified since last download")
+                        return NOT_MODIFIED
 
-                # Download content
-                content = response.content
+                    # Headers are in; reject bad responses before reading the body
+                    content_type = response.headers.get('content-type', '').lower()
+                    if content_type.startswith('text/'):
+                        # An HTML error or login page rather than a PDF
+                        logger.error(f"Not a PDF for {paper_id}: {content_type}")
+                        return None
+                    if 'pdf' not in content_type:
+                        logger.warning(f"Unexpected content type for {paper_id}: {content_type}")
 
-                if len(content) == 0:
-                    logger.error(f"Empty content received for {paper_id}")
-                    return None
+                    length = response.headers.get('content-length', '')
+                    if length.isdigit() and int(length) > self.max_bytes:
+                        logger.error(f"PDF for {paper_id} too large ({length} bytes, limit {self.max_bytes})")
+                        return None
 
-                logger.info(f"Successfully downloaded PDF for {paper_id} ({len(content)} bytes)")
-                return content
+                    return read_body(response)
 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Download attempt {attempt + 1} failed for {paper_id}: {e}")
 
                 if attempt < self.max_retries:
-                    logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    delay = self._get_retry_delay(e, attempt)
+                    logger.info(f"Retrying in {delay:.1f} seconds...")
+                    time.sleep(delay)
                 else:
                     logger.error(f"All download attempts failed for {paper_id}")
                     return None
@@ -54,23 +156,92 @@ class PDFDownloader:
                 logger.error(f"Unexpected error downloading {paper_id}: {e}")
                 return None
 
-    def download_with_progress(self, url: str, paper_id: str, chunk_size: int = 8192) -> Optional[bytes]:
+    def _read_content(self, response: requests.Response, paper_id: str) -> Optional[bytes]:
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_bytes:
+                logger.error(f"PDF for {paper_id} exceeds {self.max_bytes} bytes, aborting")
+                return None
+            chunks.append(chunk)
+        content = b''.join(chunks)
+
+        if len(content) == 0:
+            logger.error(f"Empty content received for {paper_id}")
+            return None
+
+        logger.info(f"Successfully downloaded PDF for {paper_id} ({len(content)} bytes)")
+        return content
+
+    def _write_content(self, response: requests.Response, paper_id: str, dest: Path) -> Optional[DownloadedFile]:
+        tmp_path = dest.with_name(dest.name + '.part')
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        logger.error(f"PDF for {paper_id} exceeds {self.max_bytes} bytes, aborting")
+                        return None
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            if size == 0:
+                logger.error(f"Empty content received for {paper_id}")
+                return None
+
+            os.replace(tmp_path, dest)
+        finally:
+            # Leftover only if the body was empty or reading it failed
+            tmp_path.unlink(missing_ok=True)
+
+        logger.info(f"Successfully downloaded PDF for {paper_id} ({size} bytes)")
+        return DownloadedFile(size, digest.hexdigest(),
+                              response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    def _get_retry_delay(self, error: requests.exceptions.RequestException, attempt: int) -> float:
+        """Back off exponentially with jitter, so workers failing together do not retry in lockstep"""
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code == 429:
+            if self.limiter is not None:
+                self.limiter.slow_down()
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                # Honour the server's wait, but never sleep longer than our own backoff cap
+                return min(int(retry_after), MAX_RETRY_DELAY)
+        return min(self.retry_delay * 2 ** attempt, MAX_RETRY_DELAY) + random.uniform(0, 1)
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """Streaming GET once the rate limiter allows it"""
+        if self.limiter is not None:
+            self.limiter.acquire()
+        response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        if self.limiter is not None and response.ok:
+            self.limiter.record_success()
+        return response
+
+    def download_with_progress(self, url: str, paper_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Optional[bytes]:
         """Download PDF with progress tracking (for large files)"""
         try:
             logger.info(f"Downloading PDF for {paper_id} from {url}")
 
-            response = self.session.get(url, timeout=self.timeout, stream=True)
-            response.raise_for_status()
+            with self._get(url, self.headers) as response:
+                response.raise_for_status()
 
-            total_size = int(response.headers.get('content-length', 0))
-            content = b''
+                total_size = int(response.headers.get('content-length', 0))
+                # Join once at the end; `content += chunk` recopies everything read so far
+                chunks = []
 
-            if total_size > 0:
-                logger.info(f"Downloading {total_size} bytes for {paper_id}")
+                if total_size > 0:
+                    logger.info(f"Downloading {total_size} bytes for {paper_id}")
 
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    content += chunk
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        chunks.append(chunk)
+                content = b''.join(chunks)
 
             if len(content) == 0:
                 logger.error(f"Empty content received for {paper_id}")
@@ -1,15 +1,166 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import shutil
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List, Optional
+import weakref
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+                                FIRST_COMPLETED, as_completed, wait)
+from contextlib import contextmanager, nullcontext
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 from .storage_manager import StorageManager
-from .pdf_downloader import PDFDownloader
-from .markdown_converter import MarkdownConverter
+from .pdf_downloader import DownloadedFile, MAX_PDF_BYTES, NOT_MODIFIED, PDFDownloader, POOL_MAXSIZE
+from .markdown_converter import MarkdownConverter, convert_in_worker, get_markitdown
 
 logger = logging.getLogger(__name__)
 
+# Default concurrent PDF downloads; downloads wait on the network, so more of
+# them than conversion workers keeps the converters busy
+DOWNLOAD_WORKERS = 8
+
+# Index and processing-log updates are buffered and written together once this
+# many index updates are pending or this many seconds have passed
+FLUSH_EVERY = 50
+FLUSH_SECONDS = 30
+
+# Processors still alive; their buffered updates are flushed at interpreter exit
+_live_processors: 'weakref.WeakSet[PaperProcessor]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_processors():
+    for processor in list(_live_processors):
+        processor.flush()
+
+
+class ResultStatus(IntEnum):
+    """Result statuses tallied by the driver scripts; values index per-status lists"""
+    COMPLETED = 0
+    FAILED_DOWNLOAD = 1
+    FAILED_CONVERSION = 2
+    SKIPPED = 3
+    UNCHANGED = 4
+
+
+# Status string as returned by process_paper -> ResultStatus
+STATUS_IDX = {status.name.lower(): status for status in ResultStatus}
+
+
+def results_by_status(ids_by_status: List[List[str]]) -> Dict[str, List[str]]:
+    """Turn per-status id lists indexed by ResultStatus into the summary dict"""
+    return {status.name.lower(): ids_by_status[status] for status in ResultStatus}
+
+
+def _utc_iso(ts: float) -> str:
+    """Format a time.time() value as an ISO 8601 UTC timestamp, e.g. 2024-01-01T12:00:00Z"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ts))
+
+
+def _copy_file(source: Path, dest: Path) -> None:
+    """Copy source to dest without passing the data through user space
+
+    Uses copy_file_range where available, which can share blocks (reflink)
+    on copy-on-write filesystems; otherwise shutil.copyfile, which itself
+    uses sendfile on Linux.
+    """
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copyfile(source, dest)
+        return
+
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            # e.g. EXDEV on older kernels or unsupported filesystems
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst)
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Hard-link source to dest, copying when linking is not possible"""
+    tmp_path = dest.with_name(dest.name + '.part')
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        _copy_file(source, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+class _ForwardToLogger(logging.Handler):
+    """Hand records logged in conversion workers to the parent's logger of the same name"""
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_conversion_worker(log_queue, level: int):
+    """Process pool initializer: send worker logging to the parent and build MarkItDown once"""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+    get_markitdown()
+
+
+@contextmanager
+def _conversion_process_pool(workers: int) -> Iterator[ProcessPoolExecutor]:
+    """Process pool for MarkItDown conversions whose workers start with MarkItDown ready
+
+    Workers are spawned rather than forked, since the parent already runs
+    logging and download threads. Their log records come back over a
+    multiprocessing queue and are re-emitted through the parent's loggers.
+    """
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardToLogger())
+    listener.start()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_conversion_worker,
+                                 initargs=(log_queue, logging.getLogger().getEffectiveLevel())) as pool:
+            yield pool
+    finally:
+        listener.stop()
+
+
+def _chain(first: Future, executor: Executor, fn: Callable) -> Future:
+    """Return a future for fn(first.result()), submitted to executor once first finishes
+
+    Unlike calling first.result() inside a task, no worker of executor is held
+    while first is still running.
+    """
+    chained = Future()
+
+    def relay(inner: Future) -> None:
+        error = inner.exception()
+        if error is not None:
+            chained.set_exception(error)
+        else:
+            chained.set_result(inner.result())
+
+    def submit(done: Future) -> None:
+        try:
+            executor.submit(fn, done.result()).add_done_callback(relay)
+        except BaseException as e:
+            chained.set_exception(e)
+
+    first.add_done_callback(submit)
+    return chained
+
+
 class PaperProcessor:
     def __init__(self, config: Dict):
         self.config = config
@@ -18,13 +169,41 @@ class PaperProcessor:
             timeout=config['download']['timeout'],
             max_retries=config['download']['max_retries'],
             retry_delay=config['download']['retry_delay'],
-            user_agent=config['download']['user_agent']
+            user_agent=config['download']['user_agent'],
+            pool_maxsize=max(POOL_MAXSIZE, config['download'].get('workers', DOWNLOAD_WORKERS)),
+            max_bytes=config['download'].get('max_pdf_mb', MAX_PDF_BYTES >> 20) << 20,
+            rate_limit=config['download'].get('rate_limit')
         )
-        self.converter = MarkdownConverter()
+        cache_dir = self.storage.base_dir / "cache" / "markdown" if config['conversion'].get('cache', True) else None
+        self.converter = MarkdownConverter(cache_dir=cache_dir)
+        # Set by process_papers while it runs MarkItDown in worker processes
+        self._convert_pool: Optional[ProcessPoolExecutor] = None
+
+        # pdf_url -> Future of (path, DownloadedFile) for PDFs downloaded by this processor
+        self._downloads: Dict[str, Future] = {}
+        self._downloads_lock = threading.Lock()
+
+        # Buffered index updates and log entries, written out by flush()
+        self._pending_index: List[Tuple[str, Dict, str]] = []
+        self._pending_logs: List[Dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        _live_processors.add(self)
 
     def process_paper(self, paper_data: Dict) -> Dict:
         """Process a single paper: download PDF and convert to markdown"""
+        result = self._convert_paper(self._download_paper(paper_data))
+        self.flush()
+        return result
 
+    def _download_paper(self, paper_data: Dict) -> Dict:
+        """Download and save a paper's PDF; the network-bound first stage of process_paper
+
+        Returns:
+            Stage state for _convert_paper. Its 'result' is already final when
+            the paper was skipped or failed, in which case 'pdf_info' is None.
+        """
         paper_id = paper_data['paper_id']
         start_time = time.time()
 
@@ -34,6 +213,7 @@ class PaperProcessor:
             "errors": [],
             "processing_time_seconds": 0
         }
+        stage = {"paper_data": paper_data, "result": result, "start_time": start_time, "pdf_info": None}
 
         logger.info(f"Processing paper: {paper_id} - {paper_data.get('title', 'Unknown')}")
 
@@ -44,7 +224,7 @@ class PaperProcessor:
                 if exists['pdf'] and exists['markdown']:
                     logger.info(f"Paper {paper_id} already processed, skipping")
                     result['status'] = 'skipped'
-                    return result
+                    return stage
 
             # Step 1: Download PDF
             pdf_url = paper_data.get('pdf_url')
@@ -53,13 +233,27 @@ class PaperProcessor:
                 logger.error(f"{paper_id}: {error}")
                 result['errors'].append(error)
                 result['status'] = 'failed'
-                return result
+                return stage
 
             pdf_start = time.time()
-            pdf_content = self.downloader.download(pdf_url, paper_id)
-            pdf_duration = time.time() - pdf_start
-
-            if not pdf_content:
+            pdf_path = self.storage.ensure_paper_dir(paper_id) / "paper.pdf"
+            # Streamed straight to disk; the PDF is never held in memory whole
+            validators = None if self.config['conversion']['skip_existing'] else self._previous_validators(paper_id)
+            if validators:
+                # Already processed: only fetch the PDF again if it changed
+                downloaded = self.downloader.download_to_file(pdf_url, paper_id, pdf_path, *validators)
+            else:
+                downloaded = self._download_once(pdf_url, paper_id, pdf_path)
+            pdf_end = time.time()
+            pdf_duration = pdf_end - pdf_start
+
+            if downloaded is NOT_MODIFIED:
+                logger.info(f"Paper {paper_id} unchanged since last download, skipping")
+                result['status'] = 'unchanged'
+                self._log_processing_step(paper_id, 'pdf_download', 'unchanged', pdf_duration)
+                return stage
+
+            if not downloaded:
                 error = "Failed to download PDF"
                 logger.error(f"{paper_id}: {error}")
                 result['errors'].append(error)
@@ -67,22 +261,108 @@ class PaperProcessor:
 
                 # Log failed download
                 self._log_processing_step(paper_id, 'pdf_download', 'failed', pdf_duration, error=error)
-                return result
-
-            # Save PDF
-            pdf_info = self.storage.save_pdf(paper_id, pdf_content)
+                return stage
+
+            pdf_info = {
+                'path': pdf_path,
+                'downloaded_at': _utc_iso(pdf_end),
+                'size_bytes': downloaded.size_bytes,
+                'checksum': f"sha256:{downloaded.checksum}",
+                'etag': downloaded.etag,
+                'last_modified': downloaded.last_modified
+            }
             result['pdf_downloaded'] = True
             result['pdf_size_bytes'] = pdf_info['size_bytes']
 
             # Log successful download
             self._log_processing_step(paper_id, 'pdf_download', 'success', pdf_duration,
-                                    file_size_bytes=pdf_info['size_bytes'])
+                                    file_size_bytes=pdf_info['size_bytes'], timestamp=pdf_info['downloaded_at'])
+            stage['pdf_info'] = pdf_info
+
+        except Exception as e:
+            self._fail_unexpected(result, start_time, e)
+
+        return stage
+
+    def _previous_validators(self, paper_id: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """ETag and Last-Modified recorded for a paper whose PDF and markdown are on disk"""
+        exists = self.storage.paper_exists(paper_id)
+        if not (exists['pdf'] and exists['markdown']):
+            return None
+
+        processing = (self.storage.load_paper_json(paper_id) or {}).get('processing', {})
+        etag = processing.get('pdf_etag')
+        last_modified = processing.get('pdf_last_modified')
+        if not (etag or last_modified):
+            return None
+        return etag, last_modified
+
+    def _download_once(self, pdf_url: str, paper_id: str, pdf_path: Path) -> Optional[DownloadedFile]:
+        """Download pdf_url to pdf_path unless this processor already has (or is fetching) it
+
+        Papers sharing a pdf_url wait for the first download and then hard-link
+        (or copy) its file instead of fetching the same bytes again. If that
+        download fails, each waiting paper downloads the URL itself.
+
+        Returns:
+            The downloaded file's details, or None if the download failed
+        """
+        with self._downloads_lock:
+            shared = self._downloads.get(pdf_url)
+            if shared is None:
+                self._downloads[pdf_url] = future = Future()
+
+        if shared is None:
+            downloaded = None
+            try:
+                downloaded = self.downloader.download_to_file(pdf_url, paper_id, pdf_path)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                if not downloaded:
+                    # Let a later paper with this URL try again
+                    with self._downloads_lock:
+                        del self._downloads[pdf_url]
+            future.set_result((pdf_path, downloaded))
+            return downloaded
+
+        try:
+            source, downloaded = shared.result()
+        except Exception:
+            downloaded = None
+        if not downloaded:
+            # The shared download failed; try it again for this paper
+            return self.downloader.download_to_file(pdf_url, paper_id, pdf_path)
+
+        if source != pdf_path:
+            logger.info(f"Reusing PDF downloaded for the same URL from {source} for {paper_id}")
+            try:
+                _link_or_copy(source, pdf_path)
+            except OSError as e:
+                logger.warning(f"Could not reuse {source} for {paper_id}: {e}")
+                return self.downloader.download_to_file(pdf_url, paper_id, pdf_path)
+        return downloaded
+
+    def _convert_paper(self, stage: Dict) -> Dict:
+        """Convert a downloaded PDF to markdown and record it; the CPU-bound second stage of process_paper"""
+        paper_data = stage['paper_data']
+        result = stage['result']
+        start_time = stage['start_time']
+        pdf_info = stage['pdf_info']
+        paper_id = result['paper_id']
+
+        if pdf_info is None:
+            return result
 
+        try:
             # Step 2: Convert to Markdown
             md_start = time.time()
             pdf_path = self.storage.get_pdf_path(paper_id)
-            markdown_content = self.converter.convert_pdf_to_markdown(pdf_path, paper_id)
-            md_duration = time.time() - md_start
+            markdown_content = self._convert(pdf_path, paper_id, pdf_info['checksum'])
+            md_end = time.time()
+            md_duration = md_end - md_start
+            converted_at = _utc_iso(md_end)
 
             if not markdown_content:
                 error = "Failed to convert PDF to markdown"
@@ -91,7 +371,8 @@ class PaperProcessor:
                 result['status'] = 'failed_conversion'
 
                 # Log failed conversion
-                self._log_processing_step(paper_id, 'markdown_conversion', 'failed', md_duration, error=error)
+                self._log_processing_step(paper_id, 'markdown_conversion', 'failed', md_duration,
+                                          error=error, timestamp=converted_at)
                 return result
 
             # Add metadata header
@@ -103,17 +384,20 @@ class PaperProcessor:
             result['markdown_size_bytes'] = md_info['size_bytes']
 
             # Log successful conversion
-            self._log_processing_step(paper_id, 'markdown_conversion', 'success', md_duration)
+            self._log_processing_step(paper_id, 'markdown_conversion', 'success', md_duration,
+                                      timestamp=converted_at)
 
             # Step 3: Save complete JSON with processing info
             paper_data['processing'] = {
                 "status": "completed",
                 "pdf_downloaded": True,
-                "pdf_downloaded_at": datetime.utcnow().isoformat() + "Z",
+                "pdf_downloaded_at": pdf_info['downloaded_at'],
                 "pdf_size_bytes": pdf_info['size_bytes'],
                 "pdf_checksum": pdf_info['checksum'],
+                "pdf_etag": pdf_info['etag'],
+                "pdf_last_modified": pdf_info['last_modified'],
                 "markdown_generated": True,
-                "markdown_generated_at": datetime.utcnow().isoformat() + "Z",
+                "markdown_generated_at": converted_at,
                 "markdown_size_bytes": md_info['size_bytes'],
                 "markitdown_version": "0.1.0",  # TODO: get actual version
                 "conversion_duration_seconds": md_duration,
@@ -121,38 +405,120 @@ class PaperProcessor:
             }
 
             paper_data['files'] = {
-                "pdf": str(self.storage.get_pdf_path(paper_id)),
-                "markdown": str(self.storage.get_markdown_path(paper_id)),
-                "full_json": str(self.storage.get_json_path(paper_id))
+                "pdf": self.storage.get_pdf_path_str(paper_id),
+                "markdown": self.storage.get_markdown_path_str(paper_id),
+                "full_json": self.storage.get_json_path_str(paper_id)
             }
 
             self.storage.save_paper_json(paper_id, paper_data)
 
             # Update index
-            self.storage.update_index(paper_id, paper_data, 'completed')
+            self._queue_index_update(paper_id, paper_data, 'completed')
 
             result['status'] = 'completed'
             logger.info(f"Successfully processed paper: {paper_id}")
 
         except Exception as e:
-            error = f"Unexpected error processing {paper_id}: {str(e)}"
-            logger.error(error)
-            result['errors'].append(error)
-            result['status'] = 'failed'
-            result['processing_time_seconds'] = time.time() - start_time
-
-            # Log error
-            self._log_processing_step(paper_id, 'processing', 'error', time.time() - start_time, error=error)
+            self._fail_unexpected(result, start_time, e)
             return result
 
         result['processing_time_seconds'] = time.time() - start_time
         return result
 
+    def _convert(self, pdf_path: Path, paper_id: str, checksum: str) -> Optional[str]:
+        """Convert a PDF in the conversion process pool when one is running, else in this thread"""
+        if self._convert_pool is None:
+            return self.converter.convert_pdf_to_markdown(pdf_path, paper_id, checksum)
+        return self._convert_pool.submit(
+            convert_in_worker, self.converter.cache_dir, pdf_path, paper_id, checksum).result()
+
+    def _fail_unexpected(self, result: Dict, start_time: float, e: Exception) -> None:
+        """Mark result failed after an unexpected error and log it"""
+        paper_id = result['paper_id']
+        error = f"Unexpected error processing {paper_id}: {str(e)}"
+        logger.error(error)
+        result['errors'].append(error)
+        result['status'] = 'failed'
+        result['processing_time_seconds'] = time.time() - start_time
+
+        # Log error
+        self._log_processing_step(paper_id, 'processing', 'error', time.time() - start_time, error=error)
+
+    def process_papers(self, papers: Iterable[Dict], max_workers: Optional[int] = None,
+                       download_workers: Optional[int] = None) -> Iterator[Dict]:
+        """Process papers concurrently, yielding each result as soon as it finishes
+
+        Downloads and conversions run on separate pools, so papers waiting on a
+        slow server do not hold up conversion of those already downloaded.
+        MarkItDown is CPU-bound, so unless processing.convert_in_processes is
+        false it runs in up to one worker process per core.
+
+        Args:
+            papers: Papers to process
+            max_workers: Concurrent conversions (processing.parallel_workers)
+            download_workers: Concurrent downloads (download.workers)
+        """
+        if max_workers is None:
+            max_workers = self.config.get('processing', {}).get('parallel_workers', 1)
+        max_workers = max(1, max_workers)
+        if download_workers is None:
+            download_workers = self.config['download'].get('workers', DOWNLOAD_WORKERS)
+        download_workers = max(1, download_workers)
+        in_flight = (download_workers + max_workers) * 2
+        skip_existing = self.config['conversion']['skip_existing']
+        if self.config.get('processing', {}).get('convert_in_processes', True):
+            process_pool = _conversion_process_pool(min(max_workers, os.cpu_count() or 1))
+        else:
+            process_pool = nullcontext()
+
+        # One directory scan up front instead of stat-ing each paper's files
+        processed = self.storage.list_processed_papers() if skip_existing else set()
+        # Reruns can skip thousands of papers here; don't format messages nobody will see
+        log_skips = logger.isEnabledFor(logging.INFO)
+
+        try:
+            with process_pool as self._convert_pool, \
+                    ThreadPoolExecutor(max_workers=download_workers) as download_pool, \
+                    ThreadPoolExecutor(max_workers=max_workers) as convert_pool:
+                # Keep a bounded number of papers in flight so large inputs are not all queued at once
+                pending = set()
+                for paper in papers:
+                    paper_id = paper['paper_id']
+                    if paper_id in processed:
+                        if log_skips:
+                            logger.info(f"Paper {paper_id} already processed, skipping")
+                        yield self._skipped_result(paper_id)
+                        continue
+
+                    downloaded = download_pool.submit(self._download_paper, paper)
+                    pending.add(_chain(downloaded, convert_pool, self._convert_paper))
+                    if len(pending) >= in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            pending.remove(future)
+                            yield future.result()
+
+                for future in as_completed(pending):
+                    yield future.result()
+        finally:
+            self._convert_pool = None
+            self.flush()
+
+    @staticmethod
+    def _skipped_result(paper_id: str) -> Dict:
+        return {
+            "paper_id": paper_id,
+            "status": "skipped",
+            "errors": [],
+            "processing_time_seconds": 0
+        }
+
     def _log_processing_step(self, paper_id: str, stage: str, status: str,
-                           duration_seconds: float, file_size_bytes: int = None, error: str = None):
-        """Log a processing step"""
+                           duration_seconds: float, file_size_bytes: int = None, error: str = None,
+                           timestamp: Optional[str] = None):
+        """Log a processing step; timestamp defaults to now"""
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp or _utc_iso(time.time()),
             "paper_id": paper_id,
             "stage": stage,
             "status": status,
@@ -165,12 +531,34 @@ class PaperProcessor:
         if error:
             entry["error"] = error
 
-        self.storage.append_processing_log(entry)
+        with self._pending_lock:
+            self._pending_logs.append(entry)
+
+    def _queue_index_update(self, paper_id: str, paper_data: Dict, status: str):
+        with self._pending_lock:
+            self._pending_index.append((paper_id, paper_data, status))
+            due = (len(self._pending_index) >= FLUSH_EVERY
+                   or time.monotonic() - self._last_flush >= FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered index updates and processing-log entries to storage"""
+        # Held across the writes so batches reach the files in the order they were taken
+        with self._flush_lock:
+            with self._pending_lock:
+                updates, self._pending_index = self._pending_index, []
+                entries, self._pending_logs = self._pending_logs, []
+                self._last_flush = time.monotonic()
+
+            self.storage.append_processing_log_many(entries)
+            self.storage.update_index_many(updates)
 
     def get_processing_stats(self) -> Dict:
         """Get processing statistics"""
+        self.flush()
         index = self.storage.load_index()
-        log_entries = self.storage.load_processing_log()
+        log_entries = self.storage.load_processing_log(cached=True)
 
         stats = {
             'index_stats': index['stats'],
@@ -11,21 +11,54 @@ This module defines data validation models using Pydantic for:
 All models include proper type hints, validation, and JSON schema generation.
 """
 
+import re
+from collections import Counter
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, field_validator, model_validator
+
+
+# Settings shared by the paper models. Validators are built on first validation
+# rather than at import, so code that only imports the module, or only builds
+# models with create_paper_fast, never pays for them.
+_MODEL_CONFIG = ConfigDict(str_strip_whitespace=True, defer_build=True)
+
+
+def _model_config(description: str) -> ConfigDict:
+    return ConfigDict(**_MODEL_CONFIG, json_schema_extra={"description": description})
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Numeric value of a rating or confidence, or None if it is missing or not numeric"""
+    if value is None or isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# Separators between authors or keywords given as one string, with surrounding whitespace
+_LIST_SPLIT = re.compile(r'\s*[,;]\s*')
+
+
+def _split_str_list(text: str) -> List[str]:
+    """Split a stripped "A, B; C" string into its non-empty parts"""
+    parts = [part for part in _LIST_SPLIT.split(text) if part]
+    return parts or [text]
+
+
+def _clean_str_list(values: List[Any]) -> List[str]:
+    """Stripped, non-empty strings of values; returns values itself if already clean"""
+    if all(type(value) is str and value and value == value.strip() for value in values):
+        return values
+    return [str(value).strip() for value in values if value]
 
 
 class Review(BaseModel):
     """Schema for individual paper reviews from OpenReview."""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True,
-        validate_assignment=True,
-        json_schema_extra={
-            "description": "A peer review containing ratings and detailed feedback"
-        }
-    )
+    model_config = _model_config("A peer review containing ratings and detailed feedback")
 
     review_id: str = Field(..., description="Unique identifier for the review")
     invitation: Optional[str] = Field(None, description="OpenReview invitation string")
@@ -48,8 +81,12 @@ class Review(BaseModel):
         if v is None:
             return None
 
+        # Numbers, the usual case for JSON input, need no parsing
+        if type(v) is float or type(v) is int:
+            return float(v)
+
         # Convert to string for processing
-        rating_str = str(v).strip()
+        rating_str = v.strip() if isinstance(v, str) else str(v).strip()
 
         # Handle empty strings
         if not rating_str:
@@ -59,7 +96,7 @@ class Review(BaseModel):
         if ':' in rating_str:
             # Extract the number before the colon
             try:
-                numeric_part = rating_str.split(':')[0].strip()
+                numeric_part = rating_str.split(':', 1)[0].strip()
                 return float(numeric_part)
             except (ValueError, IndexError):
                 return rating_str
@@ -71,6 +108,16 @@ class Review(BaseModel):
             # Keep as string if it contains non-numeric content
             return rating_str
 
+    @property
+    def numeric_rating(self) -> Optional[float]:
+        """Rating as a float; validate_rating has usually already converted it"""
+        return _as_float(self.rating)
+
+    @property
+    def numeric_confidence(self) -> Optional[float]:
+        """Confidence as a float, or None if it is not numeric"""
+        return _as_float(self.confidence)
+
     @field_validator('confidence')
     @classmethod
     def validate_confidence(cls, v):
@@ -78,14 +125,18 @@ class Review(BaseModel):
         if v is None:
             return None
 
-        confidence_str = str(v).strip()
+        # Integers, the usual case for JSON input, need no parsing
+        if type(v) is int:
+            return v
+
+        confidence_str = v.strip() if isinstance(v, str) else str(v).strip()
         if not confidence_str:
             return None
 
         # Try to extract numeric confidence from formats like "4: High", "3"
         if ':' in confidence_str:
             try:
-                numeric_part = confidence_str.split(':')[0].strip()
+                numeric_part = confidence_str.split(':', 1)[0].strip()
                 return int(numeric_part)
             except (ValueError, IndexError):
                 return confidence_str
@@ -99,13 +150,7 @@ class Review(BaseModel):
 class Comment(BaseModel):
     """Schema for comments and rebuttals on papers."""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True,
-        validate_assignment=True,
-        json_schema_extra={
-            "description": "Comments, rebuttals, and discussions on papers"
-        }
-    )
+    model_config = _model_config("Comments, rebuttals, and discussions on papers")
 
     note_id: str = Field(..., description="Unique identifier for the comment")
     invitation: Optional[str] = Field(None, description="OpenReview invitation string")
@@ -121,16 +166,30 @@ class Comment(BaseModel):
         return str(v).strip() or None
 
 
+# Map common decision variations (lowercased) to standardized forms
+_DECISION_MAP = {
+    'accept': 'Accept',
+    'accepted': 'Accept',
+    'reject': 'Reject',
+    'rejected': 'Reject',
+    'oral': 'Accept (Oral)',
+    'poster': 'Accept (Poster)',
+    'spotlight': 'Accept (Spotlight)',
+    'notable': 'Accept (Notable)',
+    'top': 'Accept (Top)',
+    'best': 'Accept (Best)',
+    'desk reject': 'Desk Reject',
+    'withdraw': 'Withdrawn',
+    'withdrawn': 'Withdrawn'
+}
+# Longest keys first so e.g. 'desk reject' wins over 'reject'
+_DECISION_SUBSTRINGS = tuple(sorted(_DECISION_MAP.items(), key=lambda item: -len(item[0])))
+
+
 class MetaReview(BaseModel):
     """Schema for meta-reviews and final decisions."""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True,
-        validate_assignment=True,
-        json_schema_extra={
-            "description": "Meta-reviews containing final decisions and justifications"
-        }
-    )
+    model_config = _model_config("Meta-reviews containing final decisions and justifications")
 
     id: str = Field(..., description="Unique identifier for the meta-review")
     decision: Optional[str] = Field(None, description="Final decision (Accept/Reject/etc.)")
@@ -147,32 +206,15 @@ class MetaReview(BaseModel):
         if not decision_str:
             return None
 
-        # Normalize common decision formats
         decision_lower = decision_str.lower()
 
-        # Map common variations to standardized forms
-        decision_mapping = {
-            'accept': 'Accept',
-            'accepted': 'Accept',
-            'reject': 'Reject',
-            'rejected': 'Reject',
-            'oral': 'Accept (Oral)',
-            'poster': 'Accept (Poster)',
-            'spotlight': 'Accept (Spotlight)',
-            'notable': 'Accept (Notable)',
-            'top': 'Accept (Top)',
-            'best': 'Accept (Best)',
-            'desk reject': 'Desk Reject',
-            'withdraw': 'Withdrawn',
-            'withdrawn': 'Withdrawn'
-        }
-
         # Check for exact matches first
-        if decision_str in decision_mapping:
-            return decision_mapping[decision_str]
+        decision = _DECISION_MAP.get(decision_lower)
+        if decision is not None:
+            return decision
 
-        # Check for substring matches
-        for key, value in decision_mapping.items():
+        # Check for substring matches, most specific first
+        for key, value in _DECISION_SUBSTRINGS:
             if key in decision_lower:
                 return value
 
@@ -183,13 +225,7 @@ class MetaReview(BaseModel):
 class Paper(BaseModel):
     """Schema for complete paper records with all associated data."""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True,
-        validate_assignment=True,
-        json_schema_extra={
-            "description": "Complete paper record with metadata, reviews, and discussions"
-        }
-    )
+    model_config = _model_config("Complete paper record with metadata, reviews, and discussions")
 
     # Core paper identifiers
     paper_id: str = Field(..., description="Unique paper identifier")
@@ -224,14 +260,10 @@ class Paper(BaseModel):
             return None
         elif isinstance(v, list):
             # Ensure all authors are strings
-            return [str(author).strip() for author in v if author]
+            return _clean_str_list(v)
         else:
-            # Convert string to list if comma-separated
-            authors_str = str(v).strip()
-            if ',' in authors_str:
-                return [author.strip() for author in authors_str.split(',') if author.strip()]
-            else:
-                return [authors_str]
+            # Convert string to list if comma- or semicolon-separated
+            return _split_str_list(str(v).strip())
 
     @field_validator('paper_id')
     @classmethod
@@ -249,44 +281,40 @@ class Paper(BaseModel):
             return None
         elif isinstance(v, list):
             # Ensure all keywords are strings
-            return [str(keyword).strip() for keyword in v if keyword]
+            return _clean_str_list(v)
         else:
-            # Convert string to list if comma-separated
-            keywords_str = str(v).strip()
-            if ',' in keywords_str:
-                return [kw.strip() for kw in keywords_str.split(',') if kw.strip()]
-            else:
-                return [keywords_str]
+            # Convert string to list if comma- or semicolon-separated
+            return _split_str_list(str(v).strip())
 
     @model_validator(mode='after')
     def validate_consistency(self):
         """Validate internal consistency of the paper data."""
         # Ensure num_reviews matches actual reviews count
-        if len(self.reviews) != self.num_reviews:
-            self.num_reviews = len(self.reviews)
+        num_reviews = len(self.reviews)
+        if num_reviews != self.num_reviews:
+            self.num_reviews = num_reviews
 
         # If we have meta-reviews, try to extract decision if not set
         if not self.decision and self.meta_reviews:
-            for meta_review in self.meta_reviews:
-                if meta_review.decision:
-                    self.decision = meta_review.decision
-                    break
+            decision = next((m.decision for m in self.meta_reviews if m.decision), None)
+            if decision:
+                self.decision = decision
 
         return self
 
-    @property
-    def average_rating(self) -> Optional[float]:
-        """Calculate average rating from all reviews."""
+    def numeric_ratings(self) -> List[float]:
+        """Numeric ratings of all reviews, skipping missing or non-numeric ones."""
         ratings = []
         for review in self.reviews:
-            if review.rating is not None:
-                try:
-                    # Convert to float if possible
-                    rating_val = float(review.rating)
-                    ratings.append(rating_val)
-                except (ValueError, TypeError):
-                    continue
+            rating = review.numeric_rating
+            if rating is not None:
+                ratings.append(rating)
+        return ratings
 
+    @property
+    def average_rating(self) -> Optional[float]:
+        """Calculate average rating from all reviews."""
+        ratings = self.numeric_ratings()
         return round(sum(ratings) / len(ratings), 2) if ratings else None
 
     @property
@@ -307,18 +335,15 @@ class Paper(BaseModel):
         ratings = []
         confidences = []
 
+        # One pass over the reviews for both ratings and confidences
         for review in self.reviews:
-            if review.rating is not None:
-                try:
-                    ratings.append(float(review.rating))
-                except (ValueError, TypeError):
-                    pass
-
-            if review.confidence is not None:
-                try:
-                    confidences.append(float(review.confidence))
-                except (ValueError, TypeError):
-                    pass
+            rating = review.numeric_rating
+            if rating is not None:
+                ratings.append(rating)
+
+            confidence = review.numeric_confidence
+            if confidence is not None:
+                confidences.append(confidence)
 
         return {
             "total_reviews": len(self.reviews),
@@ -332,6 +357,7 @@ class CrawlResult(BaseModel):
     """Schema for the complete result of a crawling operation."""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "description": "Complete crawling result with metadata and paper data"
         }
@@ -365,44 +391,67 @@ class CrawlResult(BaseModel):
         if not self.papers:
             return {"error": "No papers in result"}
 
-        # Calculate rating statistics
+        # Rating and review/comment counts in a single pass over the papers
         all_ratings = []
+        papers_with_reviews = total_reviews = total_comments = 0
         for paper in self.papers:
-            for review in paper.reviews:
-                if review.rating is not None:
-                    try:
-                        all_ratings.append(float(review.rating))
-                    except (ValueError, TypeError):
-                        continue
+            all_ratings.extend(paper.numeric_ratings())
+            num_reviews = len(paper.reviews)
+            papers_with_reviews += num_reviews > 0
+            total_reviews += num_reviews
+            total_comments += len(paper.comments)
 
         # Decision breakdown
-        decisions = {}
-        for paper in self.papers:
-            decision = paper.decision or "Unknown"
-            decisions[decision] = decisions.get(decision, 0) + 1
+        decisions = Counter(paper.decision or "Unknown" for paper in self.papers)
 
         return {
             "venue": self.venue,
             "year": self.year,
             "accepted_only": self.accepted_only,
             "total_papers": self.total_papers,
-            "papers_with_reviews": self.papers_with_reviews,
-            "total_reviews": self.total_reviews,
-            "total_comments": self.total_comments,
-            "average_reviews_per_paper": round(self.total_reviews / self.total_papers, 2) if self.total_papers > 0 else 0,
+            "papers_with_reviews": papers_with_reviews,
+            "total_reviews": total_reviews,
+            "total_comments": total_comments,
+            "average_reviews_per_paper": round(total_reviews / self.total_papers, 2) if self.total_papers > 0 else 0,
             "average_rating": round(sum(all_ratings) / len(all_ratings), 2) if all_ratings else None,
             "rating_range": (min(all_ratings), max(all_ratings)) if all_ratings else None,
-            "decision_breakdown": decisions,
+            "decision_breakdown": dict(decisions),
             "crawled_at": self.crawled_at.isoformat()
         }
 
 
 # Convenience functions for creating validated instances
+# Validates a whole list of papers in a single pydantic-core call
+PAPER_LIST_ADAPTER = TypeAdapter(List[Paper], config=ConfigDict(defer_build=True))
+
+
 def create_paper_from_dict(data: Dict[str, Any]) -> Paper:
     """Create a validated Paper instance from a dictionary."""
     return Paper.model_validate(data)
 
 
+def create_paper_fast(data: Dict[str, Any]) -> Paper:
+    """Create a Paper from trusted, already-clean data without running validation.
+
+    Uses ``model_construct`` for the paper and its reviews, comments and
+    meta-reviews, so no field validators run: ratings, confidences, decisions,
+    authors and keywords must already be normalized by the caller (for
+    untrusted input use create_paper_from_dict). num_reviews and decision are
+    still filled in the way validate_consistency would.
+    """
+    data = dict(data)
+    reviews = [Review.model_construct(**r) for r in data.pop('reviews', None) or ()]
+    comments = [Comment.model_construct(**c) for c in data.pop('comments', None) or ()]
+    meta_reviews = [MetaReview.model_construct(**m) for m in data.pop('meta_reviews', None) or ()]
+    data['num_reviews'] = len(reviews)
+    if not data.get('decision'):
+        for meta_review in meta_reviews:
+            if meta_review.decision:
+                data['decision'] = meta_review.decision
+                break
+    return Paper.model_construct(**data, reviews=reviews, comments=comments, meta_reviews=meta_reviews)
+
+
 def create_review_from_dict(data: Dict[str, Any]) -> Review:
     """Create a validated Review instance from a dictionary."""
     return Review.model_validate(data)
@@ -414,10 +463,21 @@ def create_comment_from_dict(data: Dict[str, Any]) -> Comment:
 
 
 def create_crawl_result(venue: str, year: int, papers: List[Dict[str, Any]],
-                       accepted_only: bool = False, api_version: Optional[str] = None) -> CrawlResult:
-    """Create a validated CrawlResult instance."""
-    # Convert paper dictionaries to Paper objects
-    paper_objects = [create_paper_from_dict(paper) for paper in papers]
+                       accepted_only: bool = False, api_version: Optional[str] = None,
+                       trusted: bool = False) -> CrawlResult:
+    """Create a validated CrawlResult instance.
+
+    The papers are validated by PAPER_LIST_ADAPTER in a single pydantic-core call.
+
+    Args:
+        trusted: Paper dictionaries are already clean (e.g. built by the crawler
+            from OpenReview data), so build them with create_paper_fast instead
+            of validating them. Paper objects are used as-is either way.
+    """
+    if trusted:
+        paper_objects = [paper if isinstance(paper, Paper) else create_paper_fast(paper) for paper in papers]
+    else:
+        paper_objects = PAPER_LIST_ADAPTER.validate_python(papers)
 
     return CrawlResult(
         venue=venue,
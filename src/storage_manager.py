@@ -1,27 +1,114 @@
-import json
+import functools
 import hashlib
+import os
+import threading
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 import logging
 
+from .utils.json_io import dumps, loads, write_json
+
 logger = logging.getLogger(__name__)
 
+PDF_CHUNK_SIZE = 1 << 20
+
+# Papers whose joined path strings are kept by StorageManager.get_paper_paths
+PATH_CACHE_SIZE = 4096
+
+
+class PaperPaths(NamedTuple):
+    """A paper's directory and file paths as plain strings"""
+    dir: str
+    pdf: str
+    markdown: str
+    json: str
+
+
+def _read_json(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _read_jsonl(path: str) -> List:
+    with open(path, 'rb') as f:
+        return [loads(line) for line in f if line.strip()]
+
+
+@functools.lru_cache(maxsize=4)
+def _read_json_cached(path: str, mtime_ns: int, size: int):
+    """Parse a JSON file once per (path, mtime, size); callers share the result"""
+    return _read_json(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_jsonl_cached(path: str, mtime_ns: int, size: int):
+    """Parse a JSON Lines file once per (path, mtime, size); callers share the result"""
+    return _read_jsonl(path)
+
+
 class StorageManager:
     def __init__(self, base_dir: str):
         self.base_dir = Path(base_dir)
         self.papers_dir = self.base_dir / "papers"
         self.index_dir = self.base_dir / "index"
         self.input_dir = self.base_dir / "input"
+        # Plain-string root for hot paths that avoid building Path objects
+        self._papers_dir_str = str(self.papers_dir)
+        # Per instance, so the cache does not keep StorageManagers alive
+        self.get_paper_paths = functools.lru_cache(maxsize=PATH_CACHE_SIZE)(self._join_paper_paths)
+
+        # Index and processing log are shared files rewritten by concurrent workers
+        self._lock = threading.Lock()
+        # In-memory index and its per-status paper counts, loaded on first update
+        self._index = None
+        self._status_counts = None
+        # Paper directories already created, so repeated saves skip the mkdir syscall
+        self._created_dirs: Set[str] = set()
 
         # Create directories
         self.papers_dir.mkdir(parents=True, exist_ok=True)
         self.index_dir.mkdir(parents=True, exist_ok=True)
         self.input_dir.mkdir(parents=True, exist_ok=True)
 
+        self._migrate_processing_log()
+
     def get_paper_dir(self, paper_id: str) -> Path:
         """Get directory path for a specific paper"""
         return self.papers_dir / paper_id
 
+    def ensure_paper_dir(self, paper_id: str) -> Path:
+        """Get a paper's directory, creating it the first time it is needed"""
+        paper_dir = self.get_paper_dir(paper_id)
+        if paper_id not in self._created_dirs:
+            paper_dir.mkdir(exist_ok=True)
+            self._created_dirs.add(paper_id)
+        return paper_dir
+
+    def _join_paper_paths(self, paper_id: str) -> PaperPaths:
+        """Join a paper's paths; get_paper_paths caches the result for recently used papers"""
+        paper_dir = os.path.join(self._papers_dir_str, paper_id)
+        return PaperPaths(paper_dir,
+                          os.path.join(paper_dir, "paper.pdf"),
+                          os.path.join(paper_dir, "paper.md"),
+                          os.path.join(paper_dir, "paper_full.json"))
+
+    def get_paper_dir_str(self, paper_id: str) -> str:
+        """Get directory path for a paper as a string (cheaper than get_paper_dir in loops)"""
+        return self.get_paper_paths(paper_id).dir
+
+    def get_pdf_path_str(self, paper_id: str) -> str:
+        """Get PDF file path for a paper as a string"""
+        return self.get_paper_paths(paper_id).pdf
+
+    def get_markdown_path_str(self, paper_id: str) -> str:
+        """Get markdown file path for a paper as a string"""
+        return self.get_paper_paths(paper_id).markdown
+
+    def get_json_path_str(self, paper_id: str) -> str:
+        """Get full JSON file path for a paper as a string"""
+        return self.get_paper_paths(paper_id).json
+
     def get_pdf_path(self, paper_id: str) -> Path:
         """Get PDF file path for a paper"""
         return self.get_paper_dir(paper_id) / "paper.pdf"
@@ -39,44 +126,114 @@ class StorageManager:
         return self.index_dir / "papers_index.json"
 
     def get_log_path(self) -> Path:
-        """Get processing log file path"""
-        return self.index_dir / "processing_log.json"
+        """Get processing log file path (JSON Lines, one entry per line)"""
+        return self.index_dir / "processing_log.jsonl"
+
+    def _migrate_processing_log(self):
+        """Convert a processing_log.json written by older versions to JSON Lines"""
+        legacy_path = self.index_dir / "processing_log.json"
+        log_path = self.get_log_path()
+        if not legacy_path.exists() or log_path.exists():
+            return
+
+        entries = _read_json(str(legacy_path)).get('log_entries', [])
+        tmp_path = log_path.with_suffix('.jsonl.part')
+        with open(tmp_path, 'wb') as f:
+            f.writelines(dumps(entry, indent=False) + b'\n' for entry in entries)
+        os.replace(tmp_path, log_path)
+        legacy_path.unlink()
+        logger.info(f"Migrated {len(entries)} processing log entries to {log_path}")
 
     def paper_exists(self, paper_id: str) -> Dict[str, bool]:
-        """Check if paper files exist"""
-        paper_dir = self.get_paper_dir(paper_id)
-        return {
-            'dir': paper_dir.exists(),
-            'pdf': self.get_pdf_path(paper_id).exists(),
-            'markdown': self.get_markdown_path(paper_id).exists(),
-            'json': self.get_json_path(paper_id).exists()
-        }
+        """Check if paper files exist, with one directory read instead of a stat per file"""
+        files = self.scan_paper_dir(paper_id)
+        del files['json_entry']
+        return files
+
+    def list_processed_papers(self) -> Set[str]:
+        """Return ids of papers whose PDF and markdown are both on disk
+
+        Reads each paper directory once instead of stat-ing every file of every
+        paper, which is much cheaper when checking thousands of papers up front.
+        """
+        processed = set()
+        try:
+            paper_dirs = os.scandir(self.papers_dir)
+        except FileNotFoundError:
+            return processed
+
+        with paper_dirs:
+            for entry in paper_dirs:
+                if not entry.is_dir():
+                    continue
+                files = self.scan_paper_dir(entry.name)
+                if files['pdf'] and files['markdown']:
+                    processed.add(entry.name)
+
+        return processed
+
+    def scan_paper_dir(self, paper_id: str) -> Dict:
+        """Check which paper files exist with a single directory read
+
+        Returns the same flags as paper_exists, plus 'json_entry': the DirEntry
+        of paper_full.json (or None) for load_paper_json_from_entry.
+        """
+        files = {'dir': False, 'pdf': False, 'markdown': False, 'json': False, 'json_entry': None}
+        try:
+            entries = os.scandir(self.get_paper_dir_str(paper_id))
+        except (FileNotFoundError, NotADirectoryError):
+            return files
+
+        files['dir'] = True
+        with entries:
+            for entry in entries:
+                if entry.name == 'paper.pdf':
+                    files['pdf'] = True
+                elif entry.name == 'paper.md':
+                    files['markdown'] = True
+                elif entry.name == 'paper_full.json':
+                    files['json'] = True
+                    files['json_entry'] = entry
+
+        return files
 
     def save_pdf(self, paper_id: str, content: bytes) -> Dict:
         """Save PDF content and return file info"""
-        paper_dir = self.get_paper_dir(paper_id)
-        paper_dir.mkdir(exist_ok=True)
-
-        pdf_path = self.get_pdf_path(paper_id)
-        with open(pdf_path, 'wb') as f:
-            f.write(content)
-
-        # Calculate checksum
-        checksum = hashlib.sha256(content).hexdigest()
-        size_bytes = len(content)
+        return self.save_pdf_stream(paper_id, (content,))
+
+    def save_pdf_stream(self, paper_id: str, chunks: Union[Iterable[bytes], BinaryIO]) -> Dict:
+        """Save a PDF from chunks of bytes or a binary file object and return file info
+
+        The checksum is computed while writing, so the content is only read
+        once. The file is written under a temporary name and moved into place,
+        so an interrupted write never leaves a truncated paper.pdf.
+        """
+        if hasattr(chunks, 'read'):
+            chunks = iter(functools.partial(chunks.read, PDF_CHUNK_SIZE), b'')
+
+        pdf_path = self.ensure_paper_dir(paper_id) / "paper.pdf"
+        tmp_path = pdf_path.with_name(pdf_path.name + '.part')
+        digest = hashlib.sha256()
+        size_bytes = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size_bytes += len(chunk)
+            os.replace(tmp_path, pdf_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
         return {
             'path': pdf_path,
             'size_bytes': size_bytes,
-            'checksum': f"sha256:{checksum}"
+            'checksum': f"sha256:{digest.hexdigest()}"
         }
 
     def save_markdown(self, paper_id: str, content: str) -> Dict:
         """Save markdown content and return file info"""
-        paper_dir = self.get_paper_dir(paper_id)
-        paper_dir.mkdir(exist_ok=True)
-
-        md_path = self.get_markdown_path(paper_id)
+        md_path = self.ensure_paper_dir(paper_id) / "paper.md"
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(content)
 
@@ -89,26 +246,48 @@ class StorageManager:
 
     def save_paper_json(self, paper_id: str, data: Dict):
         """Save complete paper data as JSON"""
-        paper_dir = self.get_paper_dir(paper_id)
-        paper_dir.mkdir(exist_ok=True)
-
-        json_path = self.get_json_path(paper_id)
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json(self.ensure_paper_dir(paper_id) / "paper_full.json", data)
 
     def load_paper_json(self, paper_id: str) -> Optional[Dict]:
         """Load paper data from JSON file"""
-        json_path = self.get_json_path(paper_id)
-        if not json_path.exists():
+        try:
+            return _read_json(self.get_json_path_str(paper_id))
+        except FileNotFoundError:
             return None
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def load_paper_json_from_entry(self, entry: os.DirEntry) -> Dict:
+        """Load paper data from a JSON file found by scan_paper_dir"""
+        return _read_json(entry.path)
+
+    def _load_json(self, path: Path, cached: bool, jsonl: bool = False):
+        """Load a JSON (or JSON Lines) file, or return None if it does not exist
 
-    def load_index(self) -> Dict:
-        """Load papers index"""
-        index_path = self.get_index_path()
-        if not index_path.exists():
+        With cached=True the parsed result is reused until the file changes and
+        is shared between callers, so it must not be modified.
+        """
+        path = str(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if cached:
+            read_cached = _read_jsonl_cached if jsonl else _read_json_cached
+            return read_cached(path, st.st_mtime_ns, st.st_size)
+        return _read_jsonl(path) if jsonl else _read_json(path)
+
+    def load_index(self, cached: bool = False) -> Dict:
+        """Load papers index
+
+        Args:
+            cached: Reuse the parsed index until the file changes. The result is
+                then shared between callers and must not be modified.
+        """
+        # update_index_many writes every change through, so the file is current
+        return self._read_index(cached)
+
+    def _read_index(self, cached: bool) -> Dict:
+        index = self._load_json(self.get_index_path(), cached)
+        if index is None:
             return {
                 'total_papers': 0,
                 'last_updated': None,
@@ -124,69 +303,94 @@ class StorageManager:
                 }
             }
 
-        with open(index_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return index
 
     def save_index(self, index_data: Dict):
-        """Save papers index"""
-        index_path = self.get_index_path()
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        """Save papers index, replacing the in-memory copy"""
+        with self._lock:
+            self._index = index_data
+            self._status_counts = Counter(paper.get('status') for paper in index_data['papers'].values())
+            self._write_index()
+
+    def _write_index(self):
+        # Compact: the index is machine-read; scripts/pretty_print_index.py formats it for people
+        write_json(self.get_index_path(), self._index, indent=False)
 
     def update_index(self, paper_id: str, paper_data: Dict, status: str):
         """Update index with paper information"""
-        index = self.load_index()
-
-        # Update paper entry
-        index['papers'][paper_id] = {
-            'title': paper_data.get('title', ''),
-            'authors': paper_data.get('authors', []),
-            'pdf_url': paper_data.get('pdf_url', ''),
-            'status': status,
-            'has_pdf': (status in ['completed', 'pdf_downloaded']),
-            'has_markdown': (status == 'completed'),
-            'decision': paper_data.get('decision', '')
-        }
+        self.update_index_many([(paper_id, paper_data, status)])
+
+    def update_index_many(self, updates: List[Tuple[str, Dict, str]]):
+        """Update index with several (paper_id, paper_data, status) entries
+
+        The index file is rewritten once per call, so callers batch updates
+        rather than calling this per paper.
+        """
+        if not updates:
+            return
+        with self._lock:
+            self._update_index(updates)
+
+    def _update_index(self, updates: List[Tuple[str, Dict, str]]):
+        if self._index is None:
+            self._index = self._read_index(cached=False)
+            self._status_counts = Counter(paper.get('status') for paper in self._index['papers'].values())
+        index = self._index
+        papers = index['papers']
+        status_counts = self._status_counts
+
+        # Update paper entries, moving each paper's count from its old status to the new one
+        for paper_id, paper_data, status in updates:
+            previous = papers.get(paper_id)
+            if previous is not None:
+                status_counts[previous.get('status')] -= 1
+            status_counts[status] += 1
+            papers[paper_id] = {
+                'title': paper_data.get('title', ''),
+                'authors': paper_data.get('authors', []),
+                'pdf_url': paper_data.get('pdf_url', ''),
+                'status': status,
+                'has_pdf': (status in ['completed', 'pdf_downloaded']),
+                'has_markdown': (status == 'completed'),
+                'decision': paper_data.get('decision', '')
+            }
 
         # Update stats
         stats = index['stats']
-        stats['total'] = len(index['papers'])
-
-        # Recalculate stats
-        status_counts = {}
-        for paper in index['papers'].values():
-            status_counts[paper['status']] = status_counts.get(paper['status'], 0) + 1
-
+        stats['total'] = len(papers)
         stats.update({
-            'completed': status_counts.get('completed', 0),
-            'pdf_downloaded': status_counts.get('pdf_downloaded', 0) + status_counts.get('completed', 0),
-            'markdown_generated': status_counts.get('completed', 0),
-            'failed_download': status_counts.get('failed_download', 0),
-            'failed_conversion': status_counts.get('failed_conversion', 0),
-            'pending': status_counts.get('pending', 0)
+            'completed': status_counts['completed'],
+            'pdf_downloaded': status_counts['pdf_downloaded'] + status_counts['completed'],
+            'markdown_generated': status_counts['completed'],
+            'failed_download': status_counts['failed_download'],
+            'failed_conversion': status_counts['failed_conversion'],
+            'pending': status_counts['pending']
         })
 
+        paper_data = updates[-1][1]
         index['last_updated'] = paper_data.get('processing', {}).get('markdown_generated_at', None)
 
-        self.save_index(index)
+        self._write_index()
 
-    def load_processing_log(self) -> List[Dict]:
-        """Load processing log entries"""
-        log_path = self.get_log_path()
-        if not log_path.exists():
-            return []
+    def load_processing_log(self, cached: bool = False) -> List[Dict]:
+        """Load processing log entries
 
-        with open(log_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('log_entries', [])
+        Args:
+            cached: Reuse the parsed log until the file changes. The result is
+                then shared between callers and must not be modified.
+        """
+        entries = self._load_json(self.get_log_path(), cached, jsonl=True)
+        return [] if entries is None else entries
 
     def append_processing_log(self, entry: Dict):
         """Append entry to processing log"""
-        log_data = {
-            'log_entries': self.load_processing_log()
-        }
-        log_data['log_entries'].append(entry)
-
-        log_path = self.get_log_path()
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
+        self.append_processing_log_many([entry])
+
+    def append_processing_log_many(self, entries: List[Dict]):
+        """Append several entries to the processing log in a single write"""
+        if not entries:
+            return
+        data = b''.join(dumps(entry, indent=False) + b'\n' for entry in entries)
+        with self._lock:
+            with open(self.get_log_path(), 'ab') as f:
+                f.write(data)
@@ -0,0 +1,339 @@
+"""
+JSON helpers for the large files produced by the crawler.
+
+Crawl outputs can be hundreds of MB, so papers are streamed one at a time
+instead of going through ``json.load``/``json.dump`` on the whole document.
+Both layouts the crawler writes are supported:
+
+- a bare list of papers: ``[{...}, {...}]``
+- a wrapped result: ``{"metadata": {...}, "papers": [{...}, ...]}``
+
+Large outputs can also be split into a directory of shard files plus an
+``index.json`` listing them, or written as JSON Lines (``.jsonl``, one paper
+per line); ``iter_papers`` reads both transparently.
+
+Serialization uses orjson when available and falls back to the stdlib.
+"""
+
+import json
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_CHUNK_SIZE = 1 << 20  # 1 MB read buffer
+# Files up to this size are read in one go and parsed by orjson, which is far
+# faster than streaming; larger ones are streamed to bound memory
+WHOLE_FILE_MAX_BYTES = 64 << 20
+SHARD_INDEX = 'index.json'
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def dumps(obj: Any, indent: bool = True, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (non-ASCII characters are kept as-is).
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        default: Fallback for objects JSON cannot represent (e.g. ``str``)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=default).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = True,
+               default: Optional[Callable[[Any], Any]] = None) -> None:
+    """Serialize obj and write it to path in a single write"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent, default=default))
+
+
+def write_papers(path: Union[str, Path], papers: Iterable[Dict[str, Any]],
+                 metadata: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+                 default: Optional[Callable[[Any], Any]] = None) -> int:
+    """Write papers to path one at a time so only a single paper is serialized at once.
+
+    Args:
+        path: Output file
+        papers: Papers to write; may be a generator
+        metadata: If given, write the wrapped ``{"metadata", "papers"}`` layout,
+            otherwise a bare list of papers. A callable is called once all papers
+            are written and its result goes after the papers list, so metadata
+            can summarize papers produced by a generator.
+        default: Fallback for objects JSON cannot represent (e.g. ``str``)
+
+    Returns:
+        Number of papers written
+    """
+    trailing = callable(metadata)
+    count = 0
+    with open(path, 'wb') as f:
+        if metadata is None:
+            f.write(b'[')
+        elif trailing:
+            f.write(b'{\n"papers": [')
+        else:
+            f.write(b'{\n"metadata": ')
+            f.write(dumps(metadata, default=default))
+            f.write(b',\n"papers": [')
+
+        for paper in papers:
+            f.write(b'\n' if count == 0 else b',\n')
+            f.write(dumps(paper, default=default))
+            count += 1
+
+        if metadata is None:
+            f.write(b'\n]\n')
+        elif trailing:
+            f.write(b'\n],\n"metadata": ')
+            f.write(dumps(metadata(), default=default))
+            f.write(b'\n}\n')
+        else:
+            f.write(b'\n]\n}\n')
+
+    return count
+
+
+def write_papers_jsonl(path: Union[str, Path], papers: Iterable[Any],
+                       default: Optional[Callable[[Any], Any]] = None) -> int:
+    """Write papers as JSON Lines, one compact paper per line, as they arrive.
+
+    Args:
+        path: Output file
+        papers: Paper dicts or pydantic models; may be a generator
+        default: Fallback for objects JSON cannot represent (e.g. ``str``)
+
+    Returns:
+        Number of papers written
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        for paper in papers:
+            if hasattr(paper, 'model_dump_json'):
+                f.write(paper.model_dump_json().encode('utf-8'))
+            else:
+                f.write(dumps(paper, indent=False, default=default))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def _write_shard(path: Path, papers: List[Dict[str, Any]],
+                 default: Optional[Callable[[Any], Any]]) -> int:
+    return write_papers(path, papers, default=default)
+
+
+def write_paper_shards(directory: Union[str, Path], papers: Iterable[Dict[str, Any]],
+                       num_shards: int = 8, max_workers: Optional[int] = None,
+                       default: Optional[Callable[[Any], Any]] = None) -> int:
+    """Split papers into shard files written in parallel worker processes.
+
+    Papers are assigned to shards by a stable hash of ``paper_id``, so paper
+    order is not preserved across shards. An ``index.json`` listing each shard
+    and its paper count is written alongside them.
+
+    Args:
+        directory: Output directory (created if missing)
+        papers: Papers to write
+        num_shards: Number of shard files
+        max_workers: Worker processes (defaults to num_shards)
+        default: Fallback for objects JSON cannot represent; must be picklable
+
+    Returns:
+        Number of papers written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    shards = [[] for _ in range(num_shards)]
+    for paper in papers:
+        key = str(paper.get('paper_id', '')).encode('utf-8')
+        shards[zlib.crc32(key) % num_shards].append(paper)
+
+    names = [f"shard_{i:03d}.json" for i in range(num_shards)]
+    with ProcessPoolExecutor(max_workers=max_workers or num_shards) as executor:
+        counts = list(executor.map(_write_shard, [directory / name for name in names],
+                                   shards, repeat(default)))
+
+    write_json(directory / SHARD_INDEX, {
+        'total_papers': sum(counts),
+        'shards': [{'path': name, 'count': count} for name, count in zip(names, counts)],
+    })
+    return sum(counts)
+
+
+def iter_papers(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield papers one at a time from a crawl output file.
+
+    Files up to WHOLE_FILE_MAX_BYTES are read with a single read and parsed
+    by orjson when it is installed. Larger files are streamed with ijson when
+    it is installed, or an incremental stdlib decoder otherwise.
+
+    Args:
+        path: Path to a JSON file in either supported layout, a ``.jsonl``
+            file, or a directory written by ``write_paper_shards``
+
+    Raises:
+        ValueError: If the file is not a list of papers or a dict with a ``papers`` list
+    """
+    path = Path(path)
+    if path.is_dir():
+        with open(path / SHARD_INDEX, 'rb') as f:
+            index = json.loads(f.read())
+        for shard in index['shards']:
+            yield from iter_papers(path / shard['path'])
+    elif path.suffix == '.jsonl':
+        yield from _iter_papers_jsonl(path)
+    elif orjson is not None and path.stat().st_size <= WHOLE_FILE_MAX_BYTES:
+        yield from _iter_papers_whole(path)
+    elif ijson is not None:
+        yield from _iter_papers_ijson(path)
+    else:
+        yield from _iter_papers_stdlib(path)
+
+
+def _iter_papers_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def _iter_papers_whole(path: Path) -> Iterator[Dict[str, Any]]:
+    data = orjson.loads(path.read_bytes())
+    if isinstance(data, dict):
+        data = data.get('papers')
+    if not isinstance(data, list):
+        raise ValueError(f"Unexpected JSON format in {path}")
+    yield from data
+
+
+def _iter_papers_ijson(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        head = f.read(_CHUNK_SIZE).lstrip()
+        f.seek(0)
+
+        if head.startswith(b'['):
+            prefix = 'item'
+        elif head.startswith(b'{'):
+            prefix = 'papers.item'
+        else:
+            raise ValueError(f"Unexpected JSON format in {path}")
+
+        yield from ijson.items(f, prefix, use_float=True)
+
+
+def _iter_papers_stdlib(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _StreamReader(f)
+        first = reader.peek()
+
+        if first == '[':
+            yield from reader.iter_array()
+            return
+
+        if first == '{':
+            reader.consume('{')
+            while reader.peek() != '}':
+                key = reader.value()
+                reader.consume(':')
+                if key == 'papers':
+                    yield from reader.iter_array()
+                    return
+                reader.value()  # skip metadata and other top-level entries
+                if reader.peek() == ',':
+                    reader.consume(',')
+
+        raise ValueError(f"Unexpected JSON format in {path}")
+
+
+class _StreamReader:
+    """Incremental JSON reader over a text file using ``JSONDecoder.raw_decode``."""
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping already-consumed text. Returns False at EOF."""
+        chunk = self.f.read(_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def consume(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number ending exactly at the buffer boundary may have been cut short
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+
+            self.pos = end
+            return obj
+
+    def iter_array(self) -> Iterator[Any]:
+        self.consume('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError("Expected ',' or ']' in JSON array")
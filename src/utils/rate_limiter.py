@@ -0,0 +1,84 @@
+"""
+Thread-safe token-bucket rate limiter for API calls.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket that allows ``rate`` operations per second across all threads."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.5,
+                 recover_after: int = 10):
+        """
+        Args:
+            rate: Sustained operations per second, and the ceiling record_success() restores
+            capacity: Maximum burst size (defaults to one second's worth of tokens)
+            min_rate: Floor that slow_down() will not go below
+            recover_after: Successes in a row after which the rate is raised again
+        """
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.min_rate = min_rate
+        self.recover_after = recover_after
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._last_slow_down = float('-inf')
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Consume a token if one is available.
+
+        Returns:
+            0 if a token was consumed, otherwise the seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def slow_down(self, factor: float = 0.5) -> None:
+        """Reduce the rate, e.g. after the server answers with HTTP 429.
+
+        Workers that hit the limit together all report it, so at most one
+        slowdown applies per cooldown of 1/rate seconds (and at least one second).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_slow_down < max(1.0, 1 / self.rate):
+                return
+            self._last_slow_down = now
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate * factor)
+
+    def record_success(self, factor: float = 1.25) -> None:
+        """Count a request the server accepted, ramping a reduced rate back up.
+
+        Every recover_after successes in a row raise the rate by factor, up to
+        the rate the limiter was created with.
+        """
+        with self._lock:
+            if self.rate >= self.max_rate:
+                return
+            self._successes += 1
+            if self._successes >= self.recover_after:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate * factor)